@@ -0,0 +1,251 @@
+// Search worker for the pre-built, sharded index written by scripts/search_shards.py.
+//
+// Speaks the message protocol of the Material theme's search worker (SETUP -> READY,
+// QUERY -> RESULT), so the theme's search UI is unchanged. Instead of building a Lunr
+// index from search_index.json, it loads a small manifest, then per query the term
+// shards whose term ranges can hold the query terms and the section shards of the
+// matching documents. Keep tokenize(), termShardsFor() and search() in sync with the
+// Python implementation in scripts/search_shards.py.
+
+const SETUP = 0;
+const READY = 1;
+const QUERY = 2;
+const RESULT = 3;
+
+const SHARD_FORMAT_VERSION = 2;
+
+// The worker lives in javascripts/, the shards in search/shards/
+const shardBase = new URL('../search/shards/', self.location.href);
+
+let manifest = null;
+let separator = null;
+let stopWords = new Set();
+let suggest = false;
+const shards = new Map();
+
+function tokenize(text) {
+    const terms = [];
+    for (const word of text.toLowerCase().split(separator)) {
+        const term = word.replace(/^[^\p{L}\p{N}_]+|[^\p{L}\p{N}_]+$/gu, '');
+        if (term.length > 1 && !stopWords.has(term)) {
+            terms.push(term);
+        }
+    }
+    return terms;
+}
+
+function loadManifest() {
+    if (!manifest) {
+        manifest = fetch(new URL('manifest.json', shardBase))
+            .then(response => response.json())
+            .then(data => {
+                if (data.version !== SHARD_FORMAT_VERSION) {
+                    throw new Error(`Unsupported search shard format ${data.version}`);
+                }
+                separator = new RegExp(data.config.separator, 'u');
+                stopWords = new Set(data.config.stop_words);
+                return data;
+            });
+    }
+    return manifest;
+}
+
+function loadShard(entry) {
+    if (!shards.has(entry.id)) {
+        shards.set(entry.id, fetch(new URL(`${entry.id}.json`, shardBase)).then(response => response.json()));
+    }
+    return shards.get(entry.id);
+}
+
+// First index in a sorted list that is not smaller than value
+function lowerBound(values, value) {
+    let low = 0;
+    let high = values.length;
+    while (low < high) {
+        const middle = (low + high) >> 1;
+        if (values[middle] < value) {
+            low = middle + 1;
+        } else {
+            high = middle;
+        }
+    }
+    return low;
+}
+
+// First index in a sorted list that is larger than value
+function upperBound(values, value) {
+    let low = 0;
+    let high = values.length;
+    while (low < high) {
+        const middle = (low + high) >> 1;
+        if (values[middle] <= value) {
+            low = middle + 1;
+        } else {
+            high = middle;
+        }
+    }
+    return low;
+}
+
+// Term shards that can hold terms starting with term: the one whose range it falls in and
+// any following ones whose first term starts with it
+function termShardsFor(data, term) {
+    const entries = data.term_shards;
+    const number = Math.max(0, upperBound(entries.map(entry => entry.first), term) - 1);
+    const selected = entries.slice(number, number + 1);
+    for (const entry of entries.slice(number + 1)) {
+        if (!entry.first.startsWith(term)) {
+            break;
+        }
+        selected.push(entry);
+    }
+    return selected;
+}
+
+function escapeHTML(text) {
+    return text.replace(/[&<>"']/g, character => `&#${character.charCodeAt(0)};`);
+}
+
+function highlight(text, pattern) {
+    return escapeHTML(text).replace(pattern, (match, before, term) => `${before}<mark>${term}</mark>`);
+}
+
+async function matchTerm(data, term) {
+    // Every query term matches as a prefix; exact matches count double
+    const scores = new Map();
+    for (const shard of await Promise.all(termShardsFor(data, term).map(loadShard))) {
+        for (let position = lowerBound(shard.terms, term);
+             position < shard.terms.length && shard.terms[position].startsWith(term); position++) {
+            const weight = shard.terms[position] === term ? 2 : 1;
+            const postings = shard.postings[position];
+            let doc = 0;
+            for (let i = 0; i < postings.length; i += 2) {
+                doc += postings[i];
+                scores.set(doc, (scores.get(doc) || 0) + postings[i + 1] * weight);
+            }
+        }
+    }
+    return scores;
+}
+
+// Title terms of the best result that complete every query term, the last one completing the
+// last query term (what the theme's search.suggest feature shows)
+function suggestions(items, terms) {
+    for (const item of items) {
+        const titleTerms = tokenize(item.plainTitle);
+        const completions = terms.map(term => titleTerms.find(titleTerm => titleTerm.startsWith(term)));
+        if (completions.every(completion => completion !== undefined)) {
+            return completions;
+        }
+    }
+    return [];
+}
+
+async function search(query) {
+    const data = await loadManifest();
+    const terms = [...new Set(tokenize(query))];
+    if (query.trim().length < data.config.min_search_length || !terms.length) {
+        return { items: [] };
+    }
+
+    // Documents matching every query term, with the sum of their scores
+    let scores = null;
+    for (const term of terms) {
+        const termScores = await matchTerm(data, term);
+        if (scores === null) {
+            scores = termScores;
+        } else {
+            for (const [doc, score] of scores) {
+                if (termScores.has(doc)) {
+                    scores.set(doc, score + termScores.get(doc));
+                } else {
+                    scores.delete(doc);
+                }
+            }
+        }
+        if (!scores.size) {
+            return suggest ? { items: [], suggest: [] } : { items: [] };
+        }
+    }
+
+    // Section shards hold consecutive document numbers
+    const docShards = data.doc_shards;
+    const starts = docShards.map(entry => entry.start);
+    const shardOf = doc => docShards[upperBound(starts, doc) - 1];
+    const loaded = new Map();
+    await Promise.all([...new Set([...scores.keys()].map(shardOf))].map(async entry => {
+        loaded.set(entry.id, await loadShard(entry));
+    }));
+
+    const escaped = terms.map(term => escapeHTML(term).replace(/[.*+?^${}()|[\]\\]/g, '\\$&'));
+    const pattern = new RegExp(`(^|[^\\p{L}\\p{N}_])(${escaped.join('|')})`, 'giu');
+    const queryTerms = Object.fromEntries(terms.map(term => [term, true]));
+
+    // Group matching documents by page, as the theme expects; every group includes its page,
+    // which is in the same section shard as its sections
+    const groups = new Map();
+    for (const [doc, score] of scores) {
+        const entry = shardOf(doc);
+        const shard = loaded.get(entry.id);
+        const [location, title, text] = shard.docs[doc - entry.start];
+        const page = location.split('#')[0];
+        if (!groups.has(page)) {
+            groups.set(page, { score: 0, items: [], shard });
+        }
+        const group = groups.get(page);
+        group.score = Math.max(group.score, score);
+        group.items.push({
+            location,
+            title: highlight(title, pattern),
+            text: highlight(text, pattern),
+            score: score / 100,
+            terms: queryTerms,
+            plainTitle: title
+        });
+    }
+
+    const items = [];
+    for (const [page, group] of [...groups].sort(([, a], [, b]) => b.score - a.score)) {
+        group.items.sort((a, b) => b.score - a.score);
+        if (!group.items.some(item => item.location === page)) {
+            const pageDoc = group.shard.docs.find(([location]) => location === page);
+            if (pageDoc !== undefined) {
+                const [location, title, text] = pageDoc;
+                group.items.push({ location, title: escapeHTML(title), text: escapeHTML(text), score: 0, terms: {} });
+            }
+        }
+        items.push(group.items);
+    }
+
+    const result = { items };
+    if (suggest) {
+        result.suggest = suggestions(items.flat().filter(item => item.plainTitle !== undefined), terms);
+    }
+    for (const item of items.flat()) {
+        delete item.plainTitle;
+    }
+    return result;
+}
+
+addEventListener('message', async event => {
+    const message = event.data;
+    switch (message.type) {
+        case SETUP:
+            suggest = Boolean(message.data && message.data.options && message.data.options.suggest);
+            try {
+                await loadManifest();
+            } catch (error) {
+                console.warn('Sharded search index unavailable', error);
+            }
+            postMessage({ type: READY });
+            break;
+        case QUERY:
+            try {
+                postMessage({ type: RESULT, data: await search(message.data) });
+            } catch (error) {
+                console.warn(`Search failed for "${message.data}"`, error);
+                postMessage({ type: RESULT, data: { items: [] } });
+            }
+            break;
+    }
+});
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Crash-safe Output Layer for the Documentation Scripts
+
+Writes are staged to temporary files outside the output tree and committed
+together with atomic renames, so an interrupted run never leaves truncated
+files behind and file watchers (e.g. `mkdocs serve`) see one batch of changes.
+Renames protect against interrupted processes, not power loss: nothing is fsynced.
+"""
+
+import errno
+import os
+import shutil
+import stat
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+# Default location for staged files, relative to the working directory
+DEFAULT_STAGING_ROOT = Path('.cache/staging')
+
+# Temporary files are created private (0600); committed files get the mode a plain open() would give
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def _apply_mode(staged_file: Path, target: Path) -> None:
+    """Give a staged file the permissions of the file it replaces, or the default for new files"""
+    try:
+        mode = stat.S_IMODE(os.stat(target).st_mode)
+    except FileNotFoundError:
+        mode = 0o666 & ~_UMASK
+    os.chmod(staged_file, mode)
+
+
+def _replace(source: Path, target: Path) -> None:
+    """Atomically move source over target, copying if they are on different file systems"""
+    try:
+        os.replace(source, target)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        # Not atomic across devices, but still never leaves a truncated target
+        tmp_target = target.with_name(f".{target.name}.tmp")
+        shutil.copy2(source, tmp_target)
+        os.replace(tmp_target, target)
+        os.unlink(source)
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Write a single file atomically (temporary file in the same directory, then rename)"""
+    import tempfile
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        _apply_mode(Path(tmp_name), path)
+        os.replace(tmp_name, path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+
+def atomic_write_text(path: Path, content: str) -> None:
+    """Write a single UTF-8 text file atomically"""
+    atomic_write_bytes(path, content.encode('utf-8'))
+
+
+class OutputTransaction:
+    """Stage file writes, copies and deletions, then apply them all at once on commit
+    
+    Staged files live in a private directory under staging_root, which should be on the
+    same file system as the outputs so that commit is a series of atomic renames. Reads
+    made through resolve()/read_bytes()/exists() see staged content, so later pipeline
+    stages observe earlier writes before they are committed. Safe to use from threads.
+    """
+    
+    def __init__(self, staging_root: Path = DEFAULT_STAGING_ROOT):
+        self.staging_root: Path = Path(staging_root)
+        self._staging_dir: Optional[Path] = None
+        self._staged: Dict[Path, Path] = {}
+        self._deleted: Set[Path] = set()
+        self._lock = threading.RLock()
+    
+    def __enter__(self) -> 'OutputTransaction':
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+    
+    @staticmethod
+    def _key(path: Path) -> Path:
+        return Path(os.path.abspath(path))
+    
+    def _new_staging_file(self, path: Path) -> Path:
+        import tempfile
+        with self._lock:
+            if self._staging_dir is None:
+                self.staging_root.mkdir(parents=True, exist_ok=True)
+                self._staging_dir = Path(tempfile.mkdtemp(dir=self.staging_root, prefix='txn-'))
+            staging_dir = self._staging_dir
+        fd, tmp_name = tempfile.mkstemp(dir=staging_dir, prefix=f"{path.name}.", suffix='.tmp')
+        os.close(fd)
+        return Path(tmp_name)
+    
+    def _stage(self, path: Path, staged_file: Path) -> None:
+        key = self._key(path)
+        with self._lock:
+            previous = self._staged.pop(key, None)
+            self._staged[key] = staged_file
+            self._deleted.discard(key)
+        if previous is not None:
+            previous.unlink()
+    
+    @property
+    def pending(self) -> int:
+        """Number of staged writes and deletions"""
+        with self._lock:
+            return len(self._staged) + len(self._deleted)
+    
+    def staged_paths(self) -> List[Path]:
+        """Get the (absolute) target paths of all staged writes"""
+        with self._lock:
+            return sorted(self._staged)
+    
+    def write_bytes(self, path: Path, data: bytes) -> None:
+        """Stage new content for path"""
+        staged_file = self._new_staging_file(Path(path))
+        staged_file.write_bytes(data)
+        _apply_mode(staged_file, Path(path))
+        self._stage(path, staged_file)
+    
+    def write_text(self, path: Path, content: str) -> None:
+        """Stage new UTF-8 text content for path"""
+        self.write_bytes(path, content.encode('utf-8'))
+    
+    def copy_file(self, source: Path, path: Path, preserve_metadata: bool = True) -> None:
+        """Stage a copy of source at path (with its mtime and permissions if preserve_metadata)"""
+        staged_file = self._new_staging_file(Path(path))
+        if preserve_metadata:
+            shutil.copy2(source, staged_file)
+        else:
+            shutil.copyfile(source, staged_file)
+            _apply_mode(staged_file, Path(path))
+        self._stage(path, staged_file)
+    
+    def link_file(self, source: Path, path: Path) -> None:
+        """Stage a hardlink to source at path; raises OSError if hardlinks are not possible"""
+        staged_file = self._new_staging_file(Path(path))
+        staged_file.unlink()
+        os.link(source, staged_file)
+        self._stage(path, staged_file)
+    
+    def delete(self, path: Path) -> None:
+        """Stage the deletion of path"""
+        with self._lock:
+            key = self._key(path)
+            staged_file = self._staged.pop(key, None)
+            if staged_file is not None:
+                staged_file.unlink()
+            self._deleted.add(key)
+    
+    def resolve(self, path: Path) -> Path:
+        """Get the file currently holding the content of path (its staged copy, if any)"""
+        with self._lock:
+            return self._staged.get(self._key(path), Path(path))
+    
+    def exists(self, path: Path) -> bool:
+        """Check whether path exists, taking staged writes and deletions into account"""
+        with self._lock:
+            key = self._key(path)
+            if key in self._staged:
+                return True
+            if key in self._deleted:
+                return False
+        return Path(path).exists()
+    
+    def read_bytes(self, path: Path) -> bytes:
+        """Read path, including staged content"""
+        return self.resolve(path).read_bytes()
+    
+    def read_text(self, path: Path) -> str:
+        """Read path as UTF-8 text, including staged content"""
+        return self.read_bytes(path).decode('utf-8')
+    
+    def commit(self) -> int:
+        """Move every staged file into place and apply deletions; returns the number of changes"""
+        with self._lock:
+            changes = 0
+            for target in sorted(self._staged):
+                target.parent.mkdir(parents=True, exist_ok=True)
+                _replace(self._staged[target], target)
+                changes += 1
+            for target in sorted(self._deleted):
+                if target.exists():
+                    target.unlink()
+                    changes += 1
+            self._staged.clear()
+            self._deleted.clear()
+            self._cleanup()
+            return changes
+    
+    def rollback(self) -> None:
+        """Discard every staged change"""
+        with self._lock:
+            self._staged.clear()
+            self._deleted.clear()
+            self._cleanup()
+    
+    def _cleanup(self) -> None:
+        if self._staging_dir is not None:
+            shutil.rmtree(self._staging_dir, ignore_errors=True)
+            self._staging_dir = None
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Micro-benchmark for ReadmeSynchronizer._fix_image_paths
+
+Generates synthetic READMEs with thousands of image references (Markdown and
+HTML syntax, with repeated paths) and times the image rewriting pass at
+increasing sizes. Time per image should stay flat as the document grows.
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sync_readmes import ReadmeSynchronizer  # noqa: E402
+
+
+def generate_readme(num_images: int) -> str:
+    """Generate a README with num_images image references mixed with prose"""
+    parts = ["# Synthetic README\n"]
+    for i in range(num_images):
+        # Every fourth reference repeats an earlier path
+        name = f"images/figure_{i // 4 if i % 4 == 0 else i}.png"
+        if i % 3 == 0:
+            parts.append(f'<img src="{name}" alt="figure {i}" width="600">\n')
+        elif i % 3 == 1:
+            parts.append(f"<img alt='figure {i}' src='{name}'>\n")
+        else:
+            parts.append(f"![Figure {i}]({name})\n")
+        parts.append("Some text describing the figure, with a [link](https://example.com) in it.\n\n")
+    return ''.join(parts)
+
+
+def main() -> int:
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description='Benchmark single-pass image path rewriting')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 2000, 4000, 8000],
+                        help='Number of image references per synthetic README')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed repetitions per size (best is reported)')
+    args = parser.parse_args()
+    
+    logging.getLogger('sync_readmes').setLevel(logging.WARNING)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        base = Path(tmp)
+        config_path = base / 'readme-sync-config.yml'
+        config_path.write_text('repositories: []\n', encoding='utf-8')
+        
+        cwd = os.getcwd()
+        os.chdir(base)
+        try:
+            synchronizer = ReadmeSynchronizer(config_path, use_cache=False)
+            source_path = base / 'i4h-workflows' / 'workflows' / 'README.md'
+            target_path = base / 'docs' / 'workflows' / 'synthetic.md'
+            
+            print(f"{'images':>8} {'bytes':>10} {'best (ms)':>10} {'us/image':>9}")
+            for size in args.sizes:
+                content = generate_readme(size)
+                best = float('inf')
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    synchronizer._fix_image_paths(content, source_path, target_path, dry_run=True)
+                    best = min(best, time.perf_counter() - start)
+                print(f"{size:>8} {len(content):>10} {best * 1000:>10.2f} {best / size * 1e6:>9.2f}")
+        finally:
+            os.chdir(cwd)
+    
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
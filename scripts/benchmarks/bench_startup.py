@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Startup-time Benchmark for the Documentation Scripts
+
+Times fresh interpreter processes, so module imports and config parsing are
+included the way `mkdocs serve` and pre-commit hooks experience them:
+
+- interpreter          `python -c pass`, the floor every other case includes
+- hook_import          `import sync_readmes` with scripts/ on sys.path
+- mkdocs_hook          the hook loaded by MkDocs itself (load_config), then on_config, the image
+                       optimization setup and an up-to-date on_pre_build; MkDocs only puts scripts/
+                       on sys.path while importing the hook, so this also fails if the hook imports
+                       a sibling module lazily (needs mkdocs)
+- sync_noop            sync_readmes.py on an up-to-date synthetic tree (every README a cache hit)
+- license_check_noop   license_header_validator.py --check on an up-to-date synthetic tree
+
+Also lists which optional heavy modules the hook import pulls in (none are expected).
+Results are printed as a table and can be written as JSON (--json) for comparison across commits.
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+
+sys.path.insert(0, str(SCRIPTS_DIR / 'benchmarks'))
+
+from bench_sync_suite import generate_tree  # noqa: E402
+
+# Version of the JSON result format
+RESULT_FORMAT_VERSION = 1
+
+# Modules that only some code paths need and that the hook import should therefore not load
+HEAVY_MODULES = ('yaml', 'argparse', 'concurrent.futures', 'datetime', 'queue', 'PIL', 'watchdog')
+
+# Loads the hook the way `mkdocs build` does and runs the events that sync before a build, plus
+# the image optimization setup that configs with assets.optimize.enabled run in on_config
+MKDOCS_HOOK_CODE = (
+    "import sys; from mkdocs.config import load_config; "
+    "config = load_config('mkdocs.yml'); "
+    "config.plugins.on_config(config); "
+    "sys.modules[next(iter(config.hooks))]._hook_synchronizer.enable_image_optimization(); "
+    "config.plugins.on_pre_build(config=config)"
+)
+
+
+def time_command(command: List[str], cwd: Path, repeat: int) -> List[float]:
+    """Time a command in fresh processes, failing if it exits non-zero"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=cwd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def hook_import_modules() -> List[str]:
+    """List the heavy modules loaded by importing sync_readmes"""
+    code = (f"import sys; sys.path.insert(0, {str(SCRIPTS_DIR)!r}); import sync_readmes; "
+            f"print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+    output = subprocess.run([sys.executable, '-c', code], check=True, capture_output=True, text=True).stdout
+    return output.split()
+
+
+def summarize(timings: List[float]) -> Dict:
+    """Summarize the timings of one benchmark case"""
+    return {
+        'runs_s': [round(t, 6) for t in timings],
+        'min_s': round(min(timings), 6),
+        'median_s': round(statistics.median(timings), 6),
+    }
+
+
+def main() -> int:
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description='Benchmark the startup time of the documentation scripts')
+    parser.add_argument('--repeat', type=int, default=20, help='Processes started per case (default: 20)')
+    parser.add_argument('--readmes', type=int, default=60, help='Number of synced READMEs (default: 60)')
+    parser.add_argument('--code-files', type=int, default=100,
+                        help='Python files checked by the license validator (default: 100)')
+    parser.add_argument('--json', type=Path, metavar='PATH', help="Write results as JSON to PATH ('-' for stdout)")
+    args = parser.parse_args()
+    
+    # The table goes to stderr when stdout carries the JSON results
+    table = sys.stderr if args.json == Path('-') else sys.stdout
+    results: Dict[str, Dict] = {}
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / 'tree'
+        tree_args = argparse.Namespace(seed=0, readmes=args.readmes, images_per_readme=2, image_size=256,
+                                       readme_size=2000, repo_files=0, code_files=args.code_files,
+                                       asset_store='content-addressed')
+        generate_tree(root, tree_args)
+        
+        python = sys.executable
+        cases = {
+            'interpreter': [python, '-c', 'pass'],
+            'hook_import': [python, '-c', f"import sys; sys.path.insert(0, {str(SCRIPTS_DIR)!r}); import sync_readmes"],
+            'sync_noop': [python, str(SCRIPTS_DIR / 'sync_readmes.py')],
+            'license_check_noop': [python, str(SCRIPTS_DIR / 'license_header_validator.py'), '--check', '-j', '1'],
+        }
+        if importlib.util.find_spec('mkdocs') is not None:
+            (root / 'mkdocs.yml').write_text(
+                f"site_name: bench\nhooks:\n  - {SCRIPTS_DIR / 'sync_readmes.py'}\n", encoding='utf-8')
+            cases['mkdocs_hook'] = [python, '-c', MKDOCS_HOOK_CODE]
+        else:
+            print("mkdocs is not installed; skipping the mkdocs_hook case", file=table)
+        
+        # One untimed run of each case brings the outputs and all caches up to date
+        for command in cases.values():
+            subprocess.run(command, cwd=root, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        
+        print(f"{'case':<20} {'min (ms)':>10} {'median (ms)':>12}", file=table)
+        for name, command in cases.items():
+            summary = summarize(time_command(command, root, args.repeat))
+            results[name] = summary
+            print(f"{name:<20} {summary['min_s'] * 1000:>10.1f} {summary['median_s'] * 1000:>12.1f}", file=table)
+    
+    heavy_modules = hook_import_modules()
+    print(f"Heavy modules loaded by the hook import: {', '.join(heavy_modules) or 'none'}", file=table)
+    
+    if args.json:
+        report = {
+            'version': RESULT_FORMAT_VERSION,
+            'parameters': {key: value for key, value in vars(args).items() if key != 'json'},
+            'environment': {
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'cpu_count': os.cpu_count(),
+            },
+            'results': results,
+            'hook_import_heavy_modules': heavy_modules,
+        }
+        output = json.dumps(report, indent=2, sort_keys=True)
+        if args.json == Path('-'):
+            print(output)
+        else:
+            args.json.write_text(output + '\n', encoding='utf-8')
+    
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmark Suite for README Sync and License Header Validation
+
+Generates synthetic i4h-workflows / i4h-asset-catalog / i4h-sensor-simulation
+trees at a configurable scale and times, cold (fresh tree, no caches) and warm
+(outputs and caches from a previous run present):
+
+- sync_all                  ReadmeSynchronizer.sync_all()
+- sync_all_fix_all_images   ReadmeSynchronizer.sync_all(fix_all_images=True)
+- fix_all_images_in_docs    ReadmeSynchronizer._fix_all_images_in_docs() on its own
+- license_check             license_header_validator --check over the non-i4h code files
+
+Results are printed as a table and can be written as JSON (--json) for comparison across commits.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import license_header_validator  # noqa: E402
+from sync_readmes import ReadmeSynchronizer  # noqa: E402
+
+# Version of the JSON result format
+RESULT_FORMAT_VERSION = 1
+
+REPOS = ('i4h-workflows', 'i4h-asset-catalog', 'i4h-sensor-simulation')
+
+CONFIG_PATH = Path('scripts/readme-sync-config.yml')
+
+LOREM = ("Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor incididunt "
+         "ut labore et dolore magna aliqua. See the [guide](../README.md) for details.\n\n")
+
+
+def generate_tree(root: Path, args: argparse.Namespace) -> None:
+    """Generate synthetic source repositories, docs pages, code files and a sync config under root"""
+    rng = random.Random(args.seed)
+    repositories = {repo: [] for repo in REPOS}
+    
+    for i in range(args.readmes):
+        repo = REPOS[i % len(REPOS)]
+        readme_dir = root / repo / f"area_{i % 7}" / f"component_{i}"
+        image_dir = readme_dir / 'images'
+        image_dir.mkdir(parents=True)
+        
+        lines = [f"# Component {i}\n\n"]
+        for j in range(args.images_per_readme):
+            # Every README also references an image whose name exists in every repository
+            name = 'overview.png' if j == 0 else f"figure_{i}_{j}.png"
+            (image_dir / name).write_bytes(rng.randbytes(args.image_size))
+            if j % 2:
+                lines.append(f'<img src="images/{name}" alt="figure {j}" width="600">\n\n')
+            else:
+                lines.append(f"![Figure {j}](images/{name})\n\n")
+        while sum(len(line) for line in lines) < args.readme_size:
+            lines.append(LOREM)
+        lines.append("```bash\npython run.py --config images/overview.png\n```\n")
+        (readme_dir / 'README.md').write_text(''.join(lines), encoding='utf-8')
+        
+        repositories[repo].append({
+            'source': f"{readme_dir.relative_to(root).as_posix()}/README.md",
+            'target': f"docs/{repo[4:]}/area-{i % 7}/component-{i}.md",
+        })
+    
+    # Non-image files that the image index has to walk over
+    for repo in REPOS:
+        for k in range(args.repo_files):
+            filler = root / repo / 'src' / f"pkg_{k // 100}" / f"module_{k}.txt"
+            filler.parent.mkdir(parents=True, exist_ok=True)
+            filler.write_text(f"file {k}\n", encoding='utf-8')
+    
+    # Hand-written docs pages with broken or relative image paths for --fix-all-images
+    manual_dir = root / 'docs' / 'manual'
+    manual_dir.mkdir(parents=True)
+    for k in range(max(1, args.readmes // 4)):
+        i = (k * 4) % args.readmes
+        refs = [f"![Figure](/assets/images/figure_{i}_{j}.png)\n" for j in range(1, args.images_per_readme)]
+        refs.append("![Overview](images/overview.png)\n")
+        (manual_dir / f"page_{k}.md").write_text(f"# Page {k}\n\n" + ''.join(refs) + LOREM, encoding='utf-8')
+    
+    # Code files for the license header validator, all with headers
+    header = license_header_validator.format_license_header('python')
+    for k in range(args.code_files):
+        code_file = root / 'tools' / f"pkg_{k // 50}" / f"tool_{k}.py"
+        code_file.parent.mkdir(parents=True, exist_ok=True)
+        code_file.write_text(f"{header}\n\ndef tool_{k}():\n    return {k}\n", encoding='utf-8')
+    
+    config = {
+        'content_thresholds': {'minimum_length': 500, 'critical_threshold': 100},
+        'assets': {'store': args.asset_store, 'link': 'copy'},
+        'repository_urls': {repo: f"https://github.com/isaac-for-healthcare/{repo}" for repo in REPOS},
+        'repositories': [{'name': repo, 'sub_readmes': entries} for repo, entries in repositories.items()],
+    }
+    (root / CONFIG_PATH).parent.mkdir(parents=True)
+    (root / CONFIG_PATH).write_text(json.dumps(config, indent=2), encoding='utf-8')  # JSON is valid YAML
+
+
+def run_sync(jobs: int, fix_all_images: bool) -> None:
+    """Run a full sync in the current directory"""
+    synchronizer = ReadmeSynchronizer(CONFIG_PATH, base_path=Path.cwd())
+    synchronizer.sync_all(fix_all_images=fix_all_images, jobs=jobs)
+
+
+def run_fix_all_images(jobs: int) -> None:
+    """Run only the docs-wide image fixing pass in the current directory"""
+    synchronizer = ReadmeSynchronizer(CONFIG_PATH, base_path=Path.cwd())
+    synchronizer._fix_all_images_in_docs(jobs=jobs)
+    synchronizer.output.commit()
+
+
+def run_license_check(jobs: int) -> None:
+    """Run the license header validator in --check mode in the current directory"""
+    validator = license_header_validator
+    cache = validator.load_validation_cache()
+    with contextlib.redirect_stdout(io.StringIO()):
+        code_files = validator.iter_code_files(validator.load_config_excludes())
+        exit_code = validator.check_headers(code_files, jobs, cache)
+    validator.save_validation_cache(cache)
+    if exit_code != 0:
+        raise RuntimeError("license check failed on the synthetic tree")
+
+
+def measure(template: Path, workdir: Path, func: Callable[[], None], warm: bool, repeat: int) -> List[float]:
+    """Time func on fresh copies of the template tree, after one untimed run if warm"""
+    timings = []
+    cwd = os.getcwd()
+    for _ in range(repeat):
+        shutil.rmtree(workdir, ignore_errors=True)
+        shutil.copytree(template, workdir)
+        os.chdir(workdir)
+        try:
+            if warm:
+                func()
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        finally:
+            os.chdir(cwd)
+    return timings
+
+
+def summarize(timings: List[float]) -> Dict:
+    """Summarize the timings of one benchmark case"""
+    return {
+        'runs_s': [round(t, 6) for t in timings],
+        'min_s': round(min(timings), 6),
+        'median_s': round(statistics.median(timings), 6),
+    }
+
+
+def main() -> int:
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description='Benchmark README sync and license validation on synthetic repos')
+    parser.add_argument('--readmes', type=int, default=60, help='Number of synced READMEs (default: 60)')
+    parser.add_argument('--images-per-readme', type=int, default=5, help='Images referenced per README (default: 5)')
+    parser.add_argument('--image-size', type=int, default=4096, help='Bytes per synthetic image (default: 4096)')
+    parser.add_argument('--readme-size', type=int, default=4000, help='Approximate bytes per README (default: 4000)')
+    parser.add_argument('--repo-files', type=int, default=2000,
+                        help='Additional non-image files per repository (default: 2000)')
+    parser.add_argument('--code-files', type=int, default=500,
+                        help='Python files checked by the license validator (default: 500)')
+    parser.add_argument('--asset-store', choices=('basename', 'content-addressed'), default='content-addressed',
+                        help='assets.store setting of the synthetic config (default: content-addressed)')
+    parser.add_argument('--jobs', '-j', type=int, default=1, help='Worker threads for sync and validation')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per case (default: 3)')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for the synthetic image data')
+    parser.add_argument('--only', nargs='+', metavar='CASE', help='Run only the named benchmark cases')
+    parser.add_argument('--json', type=Path, metavar='PATH', help="Write results as JSON to PATH ('-' for stdout)")
+    args = parser.parse_args()
+    
+    logging.getLogger('sync_readmes').setLevel(logging.ERROR)
+    
+    cases = {
+        'sync_all': lambda: run_sync(args.jobs, fix_all_images=False),
+        'sync_all_fix_all_images': lambda: run_sync(args.jobs, fix_all_images=True),
+        'fix_all_images_in_docs': lambda: run_fix_all_images(args.jobs),
+        'license_check': lambda: run_license_check(args.jobs),
+    }
+    unknown = set(args.only or []) - set(cases)
+    if unknown:
+        parser.error(f"unknown benchmark case(s): {', '.join(sorted(unknown))} (choose from {', '.join(cases)})")
+    
+    # The table goes to stderr when stdout carries the JSON results
+    table = sys.stderr if args.json == Path('-') else sys.stdout
+    results: Dict[str, Dict] = {}
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        template = Path(tmp) / 'template'
+        workdir = Path(tmp) / 'run'
+        start = time.perf_counter()
+        generate_tree(template, args)
+        print(f"Generated synthetic tree in {time.perf_counter() - start:.2f}s", file=table)
+        
+        print(f"{'case':<26} {'mode':<5} {'min (ms)':>10} {'median (ms)':>12}", file=table)
+        for name, func in cases.items():
+            if args.only and name not in args.only:
+                continue
+            results[name] = {}
+            for mode in ('cold', 'warm'):
+                summary = summarize(measure(template, workdir, func, mode == 'warm', args.repeat))
+                results[name][mode] = summary
+                print(f"{name:<26} {mode:<5} {summary['min_s'] * 1000:>10.1f} {summary['median_s'] * 1000:>12.1f}",
+                      file=table)
+    
+    if args.json:
+        parameters = {key: value for key, value in vars(args).items() if key not in ('json', 'only')}
+        report = {
+            'version': RESULT_FORMAT_VERSION,
+            'parameters': parameters,
+            'environment': {
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'cpu_count': os.cpu_count(),
+            },
+            'results': results,
+        }
+        output = json.dumps(report, indent=2, sort_keys=True)
+        if args.json == Path('-'):
+            print(output)
+        else:
+            args.json.write_text(output + '\n', encoding='utf-8')
+    
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Source Files Read from Git Objects
+
+Serves the files of a local repository at a given ref (branch, tag or commit)
+straight from its object database, so nothing needs to be checked out and the
+working tree, if there is one, is ignored. The file list with blob ids and sizes
+comes from one `git ls-tree`; contents are read through one long-running
+`git cat-file --batch` process per repository.
+"""
+
+import subprocess
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+# Tree entry mode of symbolic links, whose blobs hold the link target rather than file content
+_SYMLINK_MODE = '120000'
+
+
+class GitSourceError(RuntimeError):
+    """A ref could not be resolved or an object could not be read"""
+
+
+class GitSource:
+    """Read-only view of the files of a repository at a ref
+    
+    The ref is resolved to a commit once, when the object is created. Reads are safe from
+    several threads (they share the batch process one at a time). Call close() when done.
+    """
+    
+    def __init__(self, repo_path: Path, ref: str):
+        self.repo_path: Path = Path(repo_path)
+        self.ref: str = ref
+        self.commit: str = self._git('rev-parse', '--verify', '--quiet', f'{ref}^{{commit}}').strip()
+        
+        # Repository-relative path -> (blob id, size) of every file in the commit
+        self.files: Dict[str, Tuple[str, int]] = {}
+        for record in self._git('ls-tree', '-r', '-z', '-l', '--full-tree', self.commit).split('\0'):
+            if not record:
+                continue
+            info, path = record.split('\t', 1)
+            mode, kind, blob_id, size = info.split()
+            if kind == 'blob' and mode != _SYMLINK_MODE:
+                self.files[path] = (blob_id, int(size))
+        
+        self._lock = threading.Lock()
+        self._batch: Optional[subprocess.Popen] = None
+    
+    def _git(self, *args: str) -> str:
+        """Run a git command in the repository and return its output"""
+        result = subprocess.run(['git', '-C', str(self.repo_path), *args], capture_output=True, text=True)
+        if result.returncode != 0:
+            detail = result.stderr.strip() or 'no such ref'
+            raise GitSourceError(f"git {' '.join(args)} failed in {self.repo_path}: {detail}")
+        return result.stdout
+    
+    def blob(self, path: str) -> Tuple[str, int]:
+        """Return the blob id and size of a file, raising FileNotFoundError if the commit does not have it"""
+        try:
+            return self.files[path]
+        except KeyError:
+            raise FileNotFoundError(f"{path} not found in {self.repo_path.name} at {self.ref}") from None
+    
+    def read(self, path: str) -> bytes:
+        """Return the content of a file at the ref"""
+        blob_id, size = self.blob(path)
+        with self._lock:
+            if self._batch is None:
+                self._batch = subprocess.Popen(['git', '-C', str(self.repo_path), 'cat-file', '--batch'],
+                                               stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+            self._batch.stdin.write(blob_id.encode('ascii') + b'\n')
+            self._batch.stdin.flush()
+            header = self._batch.stdout.readline().split()
+            if len(header) != 3 or header[1] != b'blob':
+                raise GitSourceError(f"Cannot read {path} ({blob_id}) from {self.repo_path}: "
+                                     f"{b' '.join(header).decode(errors='replace') or 'git cat-file exited'}")
+            data = self._batch.stdout.read(int(header[2]))
+            self._batch.stdout.read(1)  # Newline after the content
+        if len(data) != size:
+            raise GitSourceError(f"Short read of {path} ({blob_id}) from {self.repo_path}")
+        return data
+    
+    def close(self) -> None:
+        """Stop the batch process"""
+        with self._lock:
+            if self._batch is not None:
+                self._batch.stdin.close()
+                self._batch.wait()
+                self._batch.stdout.close()
+                self._batch = None
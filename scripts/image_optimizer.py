@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Image Optimization for Synced Documentation Assets
+
+Losslessly recompresses PNG images and optionally generates WebP siblings and
+downscaled variants. Results are cached by source content hash so unchanged
+images are never reprocessed. Requires Pillow (`pip install pillow`).
+"""
+
+import hashlib
+import io
+import json
+import logging
+import shutil
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Formats that can be decoded and re-encoded without losing information we care about
+RASTER_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+
+
+def pillow_available() -> bool:
+    """Check whether Pillow can be imported"""
+    try:
+        import PIL  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class ImageOptimizer:
+    """Produce optimized versions of images, caching the results by source content hash"""
+    
+    def __init__(self, cache_dir: Path, webp: bool = False, widths: Sequence[int] = ()):
+        self.cache_dir: Path = cache_dir
+        self.webp: bool = webp
+        self.widths: Sequence[int] = sorted(set(widths))
+        
+        # Options are part of the cache key so changing them reprocesses images
+        options = json.dumps({'webp': self.webp, 'widths': list(self.widths)}, sort_keys=True)
+        self._options_key: str = hashlib.sha256(options.encode('utf-8')).hexdigest()[:8]
+    
+    @property
+    def options_key(self) -> str:
+        """Short hash of the optimization options; outputs only match for the same key"""
+        return self._options_key
+    
+    @staticmethod
+    def variant_name(name: str, variant: str) -> str:
+        """Get the file name of a variant: '' is the image itself, '.webp' a WebP sibling, '-800w' a width"""
+        path = Path(name)
+        if variant == '.webp':
+            return f"{path.stem}.webp"
+        return f"{path.stem}{variant}{path.suffix}"
+    
+    def process(self, source: Path, digest: str) -> Optional[Dict[str, Path]]:
+        """Return cached output files for an image keyed by variant, or None if it cannot be optimized"""
+        suffix = source.suffix.lower()
+        if suffix not in RASTER_EXTENSIONS:
+            return None
+        
+        entry_dir = self.cache_dir / f"{digest}-{self._options_key}"
+        index_path = entry_dir / 'index.json'
+        if index_path.exists():
+            with open(index_path, 'r', encoding='utf-8') as f:
+                return {variant: entry_dir / name for variant, name in json.load(f).items()}
+        
+        outputs = self._optimize(source, suffix)
+        if outputs is None:
+            return None
+        
+        # Write to a private temporary directory first so an interrupted run never leaves a partial
+        # entry and concurrent calls for the same image never write into each other's files
+        import tempfile
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_dir = Path(tempfile.mkdtemp(prefix=f"{entry_dir.name}.", suffix='.tmp', dir=self.cache_dir))
+        index = {}
+        for variant, data in outputs.items():
+            name = self.variant_name(f"image{suffix}", variant)
+            (tmp_dir / name).write_bytes(data)
+            index[variant] = name
+        with open(tmp_dir / 'index.json', 'w', encoding='utf-8') as f:
+            json.dump(index, f, sort_keys=True)
+        try:
+            tmp_dir.rename(entry_dir)
+        except OSError:
+            # Another call stored the same image first; its entry has the same content
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            if not index_path.exists():
+                raise
+            with open(index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        
+        return {variant: entry_dir / name for variant, name in index.items()}
+    
+    def _optimize(self, source: Path, suffix: str) -> Optional[Dict[str, bytes]]:
+        """Encode the optimized image and its variants"""
+        from PIL import Image, UnidentifiedImageError
+        
+        original = source.read_bytes()
+        try:
+            image = Image.open(io.BytesIO(original))
+            image.load()
+        except UnidentifiedImageError:
+            logger.warning(f"Cannot optimize {source}: unrecognized image data")
+            return None
+        except Exception as e:
+            logger.warning(f"Cannot optimize {source}: {e}")
+            return None
+        
+        # Animated images would lose frames when re-encoded
+        if getattr(image, 'is_animated', False):
+            return None
+        
+        is_png = suffix == '.png'
+        outputs: Dict[str, bytes] = {'': original}
+        
+        if is_png:
+            recompressed = self._encode(image, 'PNG', optimize=True)
+            if len(recompressed) < len(original):
+                outputs[''] = recompressed
+        
+        if self.webp:
+            if is_png:
+                outputs['.webp'] = self._encode(image, 'WEBP', lossless=True, method=6)
+            else:
+                outputs['.webp'] = self._encode(image, 'WEBP', quality=85, method=6)
+        
+        for width in self.widths:
+            if image.width <= width:
+                continue
+            height = max(1, round(image.height * width / image.width))
+            resized = image.resize((width, height), Image.LANCZOS)
+            if is_png:
+                outputs[f"-{width}w"] = self._encode(resized, 'PNG', optimize=True)
+            else:
+                outputs[f"-{width}w"] = self._encode(resized, 'JPEG', quality=90, optimize=True)
+        
+        return outputs
+    
+    @staticmethod
+    def _encode(image, image_format: str, **options) -> bytes:
+        """Encode an image to bytes, keeping its ICC profile"""
+        icc_profile = image.info.get('icc_profile')
+        if icc_profile:
+            options['icc_profile'] = icc_profile
+        if image_format == 'JPEG' and image.mode not in ('RGB', 'L', 'CMYK'):
+            image = image.convert('RGB')
+        buffer = io.BytesIO()
+        image.save(buffer, image_format, **options)
+        return buffer.getvalue()
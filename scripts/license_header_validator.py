@@ -20,14 +20,20 @@ License Header Validation Script
 
 This script validates and adds license headers to Python and shell files in the repository.
 It automatically excludes directories defined in the readme-sync-config.yml file.
+Use --check to only validate headers (nothing is written; exits non-zero if any are missing).
 """
 
+import hashlib
+import json
 import os
 import sys
+from itertools import islice
 from pathlib import Path
-from typing import List, Dict, Set, Optional
+from typing import List, Dict, Iterable, Iterator, Set, Optional
 import re
-import yaml
+
+from atomic_output import OutputTransaction, atomic_write_text
+from sync_config import DEFAULT_CONFIG_PATH, load_sync_config
 
 # License header text
 LICENSE_HEADER = """SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
@@ -59,40 +65,72 @@ FILE_TYPE_CONFIGS = {
     },
 }
 
+# Shebang patterns of each file type, compiled once
+SHEBANG_PATTERNS = {
+    file_type: re.compile('|'.join(f"(?:{pattern})" for pattern in config['shebang_patterns']))
+    for file_type, config in FILE_TYPE_CONFIGS.items()
+}
+
 # Static directories to ignore
 STATIC_IGNORE_DIRS = {'.git', '__pycache__', '.pytest_cache', 'node_modules', '.venv', 'venv', 'env', 'site', 'build', 'dist', 'third_party', '.devcontainer', '.vscode'}
 
 # Files to ignore
 IGNORE_FILES = {'.gitignore', '.pre-commit-config.yaml', '.coveragerc', '.python-version', 'uv.lock'}
 
+# Number of leading lines searched for the SPDX license identifier
+HEADER_SCAN_LINES = 20
+
+# Persistent cache of validation results, keyed by file path
+CACHE_PATH = Path('.cache/license_header_validator.json')
+
 
 def load_config_excludes() -> Set[str]:
-    """Load directory exclusions from readme-sync-config.yml."""
-    config_path = Path('scripts/readme-sync-config.yml')
-    excludes = set()
+    """Load directory exclusions (the repositories and repository_urls names) from readme-sync-config.yml."""
+    config_path = DEFAULT_CONFIG_PATH
     
     if not config_path.exists():
-        return excludes
+        return set()
     
     try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f)
-        
-        # Extract repository names from the config
-        if 'repositories' in config:
-            for repo in config['repositories']:
-                if 'name' in repo:
-                    excludes.add(repo['name'])
-        
-        # Also check repository_urls section
-        if 'repository_urls' in config:
-            for repo_name in config['repository_urls'].keys():
-                excludes.add(repo_name)
-                
+        return set(load_sync_config(config_path).exclude_dirs)
     except Exception as e:
         print(f"Warning: Could not load config file {config_path}: {e}")
+        return set()
+
+
+def validation_signature() -> str:
+    """Hash of everything that affects validation results; a change invalidates the cache."""
+    rules = json.dumps({
+        'license_header': LICENSE_HEADER,
+        'file_type_configs': FILE_TYPE_CONFIGS,
+        'header_scan_lines': HEADER_SCAN_LINES,
+    }, sort_keys=True)
+    return hashlib.sha256(rules.encode('utf-8')).hexdigest()
+
+
+def load_validation_cache() -> Dict[str, Dict]:
+    """Load cached validation results, discarding them if the header or file type rules changed."""
+    if not CACHE_PATH.exists():
+        return {}
     
-    return excludes
+    try:
+        with open(CACHE_PATH, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    
+    if cache.get('signature') != validation_signature():
+        return {}
+    return cache.get('files', {})
+
+
+def save_validation_cache(entries: Dict[str, Dict]) -> None:
+    """Persist validation results for the next run."""
+    try:
+        atomic_write_text(CACHE_PATH, json.dumps({'signature': validation_signature(), 'files': entries},
+                                                 sort_keys=True))
+    except OSError as e:
+        print(f"Warning: Could not write validation cache {CACHE_PATH}: {e}")
 
 
 def get_file_type(file_path: Path) -> Optional[str]:
@@ -112,11 +150,12 @@ def has_shebang(content: str, file_type: str) -> bool:
     if not content:
         return False
     
-    first_line = content.split('\n')[0]
-    config = FILE_TYPE_CONFIGS.get(file_type, {})
-    shebang_patterns = config.get('shebang_patterns', [])
+    pattern = SHEBANG_PATTERNS.get(file_type)
+    if pattern is None:
+        return False
     
-    return any(re.match(pattern, first_line) for pattern in shebang_patterns)
+    first_line = content.split('\n', 1)[0]
+    return pattern.match(first_line) is not None
 
 
 def format_license_header(file_type: str) -> str:
@@ -140,13 +179,25 @@ def has_license_header(content: str, file_type: str) -> bool:
     config = FILE_TYPE_CONFIGS.get(file_type, {})
     comment_prefix = config.get('comment_prefix', '# ')
     
-    # Look for commented SPDX license identifier in the first 20 lines
-    lines = content.split('\n')[:20]
-    for line in lines:
-        stripped_line = line.strip()
-        if stripped_line.startswith(comment_prefix.strip()) and 'SPDX-License-Identifier' in stripped_line:
-            return True
-    return False
+    # Look for commented SPDX license identifier in the first lines
+    lines = content.split('\n', HEADER_SCAN_LINES)[:HEADER_SCAN_LINES]
+    return any(is_license_line(line, comment_prefix) for line in lines)
+
+
+def is_license_line(line: str, comment_prefix: str) -> bool:
+    """Check if a line is a commented SPDX license identifier."""
+    stripped_line = line.strip()
+    return stripped_line.startswith(comment_prefix.strip()) and 'SPDX-License-Identifier' in stripped_line
+
+
+def file_has_license_header(file_path: Path, file_type: str) -> bool:
+    """Check a file for a license header, reading only its first lines."""
+    config = FILE_TYPE_CONFIGS.get(file_type, {})
+    comment_prefix = config.get('comment_prefix', '# ')
+    
+    with open(file_path, 'r', encoding='utf-8') as f:
+        # Stops reading at the first SPDX hit
+        return any(is_license_line(line, comment_prefix) for line in islice(f, HEADER_SCAN_LINES))
 
 
 def add_license_header(content: str, file_type: str) -> str:
@@ -173,7 +224,11 @@ def add_license_header(content: str, file_type: str) -> str:
 
 def find_code_files(exclude_dirs: Set[str]) -> List[Path]:
     """Find all code files in the repository."""
-    code_files = []
+    return sorted(iter_code_files(exclude_dirs))
+
+
+def iter_code_files(exclude_dirs: Set[str]) -> Iterator[Path]:
+    """Yield code files in the repository as the directory walk finds them."""
     root_dir = Path('.')
     
     # Combine static ignores with config-based excludes
@@ -186,22 +241,63 @@ def find_code_files(exclude_dirs: Set[str]) -> List[Path]:
         for file in files:
             if file in IGNORE_FILES:
                 continue
-                
+            
             file_path = Path(root) / file
             
             # Skip if it's a symlink
             if file_path.is_symlink():
                 continue
-                
+            
             # Check if it's a code file
             if get_file_type(file_path):
-                code_files.append(file_path)
+                yield file_path
+
+
+def git_changed_files(base_ref: Optional[str] = None, staged: bool = False) -> List[Path]:
+    """List files changed relative to the merge base with base_ref, or staged in the index."""
+    import subprocess
+    
+    if staged:
+        command = ['git', 'diff', '--name-only', '--relative', '--diff-filter=ACMR', '--cached']
+    else:
+        merge_base = subprocess.run(
+            ['git', 'merge-base', base_ref, 'HEAD'],
+            check=True, capture_output=True, text=True
+        ).stdout.strip()
+        # Compare the working tree so uncommitted edits are included too
+        command = ['git', 'diff', '--name-only', '--relative', '--diff-filter=ACMR', merge_base]
+    
+    output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+    return [Path(line) for line in output.splitlines() if line]
+
+
+def filter_code_files(paths: Iterable[Path], exclude_dirs: Set[str]) -> List[Path]:
+    """Apply the same ignore rules as find_code_files to an explicit list of files or directories."""
+    all_ignore_dirs = STATIC_IGNORE_DIRS | exclude_dirs
+    code_files = set()
+    
+    for path in paths:
+        if path.is_dir():
+            for root, dirs, files in os.walk(path):
+                dirs[:] = [d for d in dirs if d not in all_ignore_dirs]
+                code_files.update(filter_code_files((Path(root) / f for f in files), exclude_dirs))
+            continue
+        
+        if any(part in all_ignore_dirs for part in path.parent.parts):
+            continue
+        if path.name in IGNORE_FILES or path.is_symlink() or not path.is_file():
+            continue
+        if get_file_type(path):
+            code_files.add(path)
     
     return sorted(code_files)
 
 
-def process_file(file_path: Path) -> Dict[str, any]:
-    """Process a single file to check/add license header."""
+def process_file(file_path: Path, output: Optional[OutputTransaction] = None) -> Dict[str, any]:
+    """Process a single file to check/add license header.
+    
+    With an output transaction the new content is staged and only written when it is committed.
+    """
     result = {
         'file': file_path,
         'file_type': get_file_type(file_path),
@@ -223,9 +319,11 @@ def process_file(file_path: Path) -> Dict[str, any]:
             # Add license header
             new_content = add_license_header(content, result['file_type'])
             
-            # Write back to file
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(new_content)
+            # Write back to file (atomically, so an interrupted run never truncates it)
+            if output is not None:
+                output.write_text(file_path, new_content)
+            else:
+                atomic_write_text(file_path, new_content)
             
             result['modified'] = True
     
@@ -235,8 +333,142 @@ def process_file(file_path: Path) -> Dict[str, any]:
     return result
 
 
+def check_file(file_path: Path, cache: Optional[Dict[str, Dict]] = None) -> Dict[str, any]:
+    """Check a single file for a license header without modifying it.
+    
+    With a cache, files whose size and mtime are unchanged are answered from a single stat.
+    Otherwise the header prefix is hashed so touched-but-identical files still hit the cache.
+    """
+    result = {
+        'file': file_path,
+        'file_type': get_file_type(file_path),
+        'has_header': False,
+        'cached': False,
+        'cache_entry': None,
+        'error': None
+    }
+    
+    try:
+        if cache is None:
+            result['has_header'] = file_has_license_header(file_path, result['file_type'])
+            return result
+        
+        st = file_path.stat()
+        entry = cache.get(str(file_path))
+        if entry and entry['size'] == st.st_size and entry['mtime_ns'] == st.st_mtime_ns:
+            result['has_header'] = entry['has_header']
+            result['cached'] = True
+            return result
+        
+        with open(file_path, 'r', encoding='utf-8') as f:
+            prefix = ''.join(islice(f, HEADER_SCAN_LINES))
+        prefix_hash = hashlib.sha256(prefix.encode('utf-8')).hexdigest()
+        
+        if entry and entry['hash'] == prefix_hash:
+            result['has_header'] = entry['has_header']
+            result['cached'] = True
+        else:
+            result['has_header'] = has_license_header(prefix, result['file_type'])
+        
+        result['cache_entry'] = {
+            'size': st.st_size,
+            'mtime_ns': st.st_mtime_ns,
+            'hash': prefix_hash,
+            'has_header': result['has_header'],
+        }
+    except Exception as e:
+        result['error'] = str(e)
+    
+    return result
+
+
+def update_cache(cache: Optional[Dict[str, Dict]], result: Dict[str, any]) -> None:
+    """Record a fresh check result in the cache."""
+    if cache is not None and result.get('cache_entry'):
+        cache[str(result['file'])] = result['cache_entry']
+
+
+def check_headers(code_files: Iterable[Path], jobs: int, cache: Optional[Dict[str, Dict]] = None) -> int:
+    """Validate license headers on a thread pool without writing anything. Returns the exit code."""
+    missing = []
+    errors = []
+    total = 0
+    cached = 0
+    
+    from concurrent.futures import ThreadPoolExecutor
+    
+    # When given a generator, files are checked while the walk is still discovering more
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        for result in executor.map(lambda path: check_file(path, cache), code_files):
+            total += 1
+            cached += result['cached']
+            update_cache(cache, result)
+            if result['error']:
+                errors.append(result)
+            elif not result['has_header']:
+                missing.append(result)
+    
+    for result in sorted(errors, key=lambda r: r['file']):
+        print(f"❌ ERROR: {result['file']}: {result['error']}")
+    for result in sorted(missing, key=lambda r: r['file']):
+        print(f"❌ MISSING HEADER: {result['file']} ({result['file_type']})")
+    
+    print()
+    print(f"Checked {total} files: {total - len(missing) - len(errors)} with headers, "
+          f"{len(missing)} missing, {len(errors)} errors")
+    if cache is not None:
+        print(f"Cached results reused: {cached}")
+    
+    if missing or errors:
+        print("Run 'python scripts/license_header_validator.py' to add the missing headers.")
+        return 1
+    return 0
+
+
 def main():
     """Main function."""
+    import argparse
+    import subprocess
+    
+    parser = argparse.ArgumentParser(description='Validate and add SPDX license headers')
+    parser.add_argument(
+        '--check',
+        action='store_true',
+        help='Only validate headers: write nothing and exit non-zero if any file is missing one'
+    )
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=min(32, (os.cpu_count() or 1) * 4),
+        metavar='N',
+        help='Number of files checked concurrently in --check mode'
+    )
+    file_selection = parser.add_mutually_exclusive_group()
+    file_selection.add_argument(
+        '--changed-since',
+        metavar='REF',
+        help='Only process files changed since the merge base with REF (e.g. origin/main), '
+             'including uncommitted changes'
+    )
+    file_selection.add_argument(
+        '--staged',
+        action='store_true',
+        help='Only process files staged in the git index (for pre-commit hooks)'
+    )
+    file_selection.add_argument(
+        'paths',
+        nargs='*',
+        type=Path,
+        default=[],
+        help='Only process these files or directories'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help=f'Re-check every file instead of reusing results cached in {CACHE_PATH}'
+    )
+    args = parser.parse_args()
+    
     # Load exclusions from config
     exclude_dirs = load_config_excludes()
     
@@ -244,8 +476,31 @@ def main():
     print(f"Excluding directories: {', '.join(sorted(exclude_dirs)) if exclude_dirs else 'none'}")
     print()
     
+    # Select the files to process: changed/staged in git, given explicitly, or the whole tree
+    try:
+        if args.changed_since or args.staged:
+            selected = git_changed_files(args.changed_since, args.staged)
+            code_files = filter_code_files(selected, exclude_dirs)
+        elif args.paths:
+            code_files = filter_code_files(args.paths, exclude_dirs)
+        else:
+            code_files = None
+    except subprocess.CalledProcessError as e:
+        print(f"Error: git command failed: {' '.join(e.cmd)}: {e.stderr.strip()}")
+        sys.exit(1)
+    
+    cache = None if args.no_cache else load_validation_cache()
+    
+    if args.check:
+        exit_code = check_headers(code_files if code_files is not None else iter_code_files(exclude_dirs),
+                                  max(1, args.jobs), cache)
+        if cache is not None:
+            save_validation_cache(cache)
+        sys.exit(exit_code)
+    
     # Find all code files
-    code_files = find_code_files(exclude_dirs)
+    if code_files is None:
+        code_files = find_code_files(exclude_dirs)
     
     if not code_files:
         print("No Python or shell files found.")
@@ -260,22 +515,29 @@ def main():
     files_modified = 0
     files_with_errors = 0
     
-    for file_path in code_files:
-        result = process_file(file_path)
-        
-        if result['error']:
-            files_with_errors += 1
-            print(f"❌ ERROR: {result['file']}: {result['error']}")
-        elif result['has_header']:
-            files_with_headers += 1
-            print(f"✅ HAS HEADER: {result['file']}")
-        elif result['needs_header']:
-            files_needing_headers += 1
-            if result['modified']:
-                files_modified += 1
-                print(f"✅ ADDED HEADER: {result['file']} ({result['file_type']})")
+    # Added headers are staged and written together once every file has been processed
+    with OutputTransaction() as output:
+        for file_path in code_files:
+            # Files known to have a header are answered from the cache without reading them
+            result = check_file(file_path, cache)
+            if result['error'] or not result['has_header']:
+                result = process_file(file_path, output)
             else:
-                print(f"❌ FAILED TO ADD: {result['file']} ({result['file_type']})")
+                update_cache(cache, result)
+            
+            if result['error']:
+                files_with_errors += 1
+                print(f"❌ ERROR: {result['file']}: {result['error']}")
+            elif result['has_header']:
+                files_with_headers += 1
+                print(f"✅ HAS HEADER: {result['file']}")
+            elif result['needs_header']:
+                files_needing_headers += 1
+                if result['modified']:
+                    files_modified += 1
+                    print(f"✅ ADDED HEADER: {result['file']} ({result['file_type']})")
+                else:
+                    print(f"❌ FAILED TO ADD: {result['file']} ({result['file_type']})")
     
     # Summary
     print()
@@ -288,6 +550,9 @@ def main():
     print(f"Files modified: {files_modified}")
     print(f"Files with errors: {files_with_errors}")
     
+    if cache is not None:
+        save_validation_cache(cache)
+    
     # Exit with error code if there were issues
     if files_with_errors > 0:
         sys.exit(1)
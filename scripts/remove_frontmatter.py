@@ -1,56 +1,194 @@
 #!/usr/bin/env python3
-"""Remove frontmatter and attribution from markdown files"""
 
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Remove Frontmatter and Attribution from Markdown Files
+
+Strips YAML frontmatter and `!!! info "Source"` attribution boxes from the
+synced pages listed in readme-sync-config.yml, or from the files, directories
+and glob patterns given on the command line. Files are processed on a thread
+pool, only files that change are rewritten, and all rewrites are applied
+together with atomic renames. Use --check to only report files that would change.
+"""
+
+import glob
+import os
 import re
+import sys
 from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from atomic_output import OutputTransaction
+from sync_config import DEFAULT_CONFIG_PATH, load_sync_config
+
+# YAML frontmatter: everything between --- markers at the start of the file
+FRONTMATTER_PATTERN = re.compile(r'^---\n.*?\n---\n\n?', re.DOTALL)
+
+# Attribution info boxes added by earlier versions of the README sync
+ATTRIBUTION_PATTERN = re.compile(r'!!! info "Source"\n(?:    .*\n)*\n?', re.MULTILINE)
+ATTRIBUTION_MARKER = '!!! info "Source"\n'
+
 
-def remove_frontmatter_and_attribution(file_path):
-    """Remove YAML frontmatter and attribution blocks from a markdown file"""
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+def strip_frontmatter_and_attribution(content: str) -> str:
+    """Remove YAML frontmatter and attribution blocks from markdown content
     
-    # Remove YAML frontmatter (everything between --- markers at the start)
-    frontmatter_pattern = r'^---\n.*?\n---\n\n?'
-    content = re.sub(frontmatter_pattern, '', content, flags=re.DOTALL)
+    Content without either is returned unchanged (leading blank lines are only removed
+    together with a match).
+    """
+    # Cheap checks first: most files have neither
+    has_frontmatter = content.startswith('---\n')
+    if not has_frontmatter and ATTRIBUTION_MARKER not in content:
+        return content
     
-    # Remove attribution info boxes
-    attribution_pattern = r'!!! info "Source"\n(?:    .*\n)*\n?'
-    content = re.sub(attribution_pattern, '', content, flags=re.MULTILINE)
+    stripped = FRONTMATTER_PATTERN.sub('', content, count=1) if has_frontmatter else content
+    stripped = ATTRIBUTION_PATTERN.sub('', stripped)
+    if stripped == content:
+        return content
     
     # Remove any leading blank lines
-    content = content.lstrip('\n')
-    
-    # Write back
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.write(content)
-    
-    return True
-
-# List of files that have sync tags
-files_to_process = [
-    '/workspace/docs/workflows/robotic-ultrasound-simulation.md',
-    '/workspace/docs/workflows/robotic-ultrasound-quick-start.md',
-    '/workspace/docs/workflows/robotic-ultrasound-dds-communication.md',
-    '/workspace/docs/workflows/robotic-surgery-surgical-tasks.md',
-    '/workspace/docs/workflows/robotic-surgery-quick-start.md',
-    '/workspace/docs/sensor-simulation/ultrasound-raytracing.md',
-    '/workspace/docs/workflows/tutorials/bring-your-own-xr.md',
-    '/workspace/docs/workflows/tutorials/bring-your-own-patient.md',
-    '/workspace/docs/workflows/robotic-ultrasound-train-pi-zero.md',
-    '/workspace/docs/workflows/robotic-ultrasound-train-gr00t.md',
-    '/workspace/docs/workflows/tutorials/mira-teleoperation.md',
-    '/workspace/docs/workflows/telesurgery-quick-start.md',
-    '/workspace/docs/workflows/robotic-ultrasound-visualization-tools.md',
-    '/workspace/docs/workflows/robotic-ultrasound-policy-runner.md',
-    '/workspace/docs/workflows/robotic-ultrasound-holoscan-apps.md',
-]
-
-# Process each file
-for file_path in files_to_process:
+    return stripped.lstrip('\n')
+
+
+def process_file(file_path: Path, output: Optional[OutputTransaction] = None) -> Dict[str, any]:
+    """Strip a single file, staging the result in output unless it is None (check only)."""
+    result = {
+        'file': file_path,
+        'changed': False,
+        'error': None
+    }
+    
     try:
-        if remove_frontmatter_and_attribution(file_path):
-            print(f"✓ Processed: {file_path}")
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        
+        stripped = strip_frontmatter_and_attribution(content)
+        if stripped != content:
+            result['changed'] = True
+            if output is not None:
+                output.write_text(file_path, stripped)
     except Exception as e:
-        print(f"✗ Error processing {file_path}: {e}")
+        result['error'] = str(e)
+    
+    return result
+
+
+def config_targets(config_path: Path) -> List[Path]:
+    """List the synced target pages of the README sync configuration that exist."""
+    targets = [Path(target) for target in load_sync_config(config_path).target_map]
+    return [target for target in targets if target.is_file()]
+
+
+def expand_paths(patterns: Iterable[str]) -> List[Path]:
+    """Expand files, directories (all markdown files below them) and glob patterns, without duplicates."""
+    files = set()
+    for pattern in patterns:
+        matches = glob.glob(pattern, recursive=True) if glob.has_magic(pattern) else [pattern]
+        if not matches:
+            print(f"Warning: No files match {pattern}")
+        for match in matches:
+            path = Path(match)
+            if path.is_dir():
+                files.update(p for p in path.rglob('*.md') if p.is_file())
+            else:
+                files.add(path)
+    return sorted(files)
+
+
+def main():
+    """Main function."""
+    import argparse
+    from concurrent.futures import ThreadPoolExecutor
+    
+    parser = argparse.ArgumentParser(description='Remove YAML frontmatter and attribution boxes from markdown files')
+    parser.add_argument(
+        'paths',
+        nargs='*',
+        default=[],
+        help="Files, directories or glob patterns (e.g. 'docs/**/*.md') to process "
+             "instead of the synced pages listed in the configuration"
+    )
+    parser.add_argument(
+        '--config',
+        type=Path,
+        default=DEFAULT_CONFIG_PATH,
+        help=f'README sync configuration whose target pages are processed by default (default: {DEFAULT_CONFIG_PATH})'
+    )
+    parser.add_argument(
+        '--check',
+        action='store_true',
+        help='Only report files that would change: write nothing and exit non-zero if there are any'
+    )
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=min(32, (os.cpu_count() or 1) * 4),
+        metavar='N',
+        help='Number of files processed concurrently'
+    )
+    args = parser.parse_args()
+    
+    if args.paths:
+        files = expand_paths(args.paths)
+    elif args.config.exists():
+        files = config_targets(args.config)
+    else:
+        print(f"Error: Configuration file not found: {args.config}")
+        sys.exit(1)
+    
+    if not files:
+        print("No markdown files found.")
+        return
+    
+    changed = []
+    errors = []
+    
+    # Rewritten files are staged and moved into place together once every file has been processed
+    with OutputTransaction() as output:
+        staging = None if args.check else output
+        with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as executor:
+            for result in executor.map(lambda path: process_file(path, staging), files):
+                if result['error']:
+                    errors.append(result)
+                elif result['changed']:
+                    changed.append(result)
+        if errors and not args.check:
+            # Leave every file untouched rather than applying a partial cleanup
+            output.rollback()
+    
+    for result in errors:
+        print(f"❌ ERROR: {result['file']}: {result['error']}")
+    for result in changed:
+        if args.check:
+            print(f"❌ HAS FRONTMATTER OR ATTRIBUTION: {result['file']}")
+        elif not errors:
+            print(f"✅ STRIPPED: {result['file']}")
+    
+    print()
+    print(f"Processed {len(files)} files: {len(changed)} {'to strip' if args.check else 'stripped'}, "
+          f"{len(files) - len(changed) - len(errors)} unchanged, {len(errors)} errors")
+    
+    if errors:
+        if not args.check:
+            print("Nothing was written because of the errors above.")
+        sys.exit(1)
+    if args.check and changed:
+        print("Run 'python scripts/remove_frontmatter.py' to strip them.")
+        sys.exit(1)
+
 
-print("\nDone! All frontmatter and attribution tags have been removed.")
\ No newline at end of file
+if __name__ == '__main__':
+    main()
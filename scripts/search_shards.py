@@ -0,0 +1,546 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Pre-built, Section-sharded Search Index
+
+MkDocs hook that replaces the monolithic index of the stock `search` plugin with
+pre-built shards, so the browser never builds an index and only downloads what a
+query needs. Document titles and teasers go into one shard per top-level `nav`
+section (Workflows, Asset Catalog, ...), split by subsections when larger than
+DOC_SHARD_BYTES. Precomputed BM25 postings go into term shards holding
+consecutive ranges of the sorted vocabulary, so each query term is routed by its
+full text to the one or two term shards that can contain it. The search worker
+(docs/javascripts/search-worker.js, which replaces the theme's Lunr worker) then
+loads only the document shards of the sections with matches.
+
+Run directly to report the bytes each sample query downloads, against the size
+of the monolithic index, and the time to its first result.
+"""
+
+import html
+import json
+import logging
+import math
+import os
+import re
+import sys
+import time
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Pattern, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Version of the manifest and shard format, checked by the search worker
+SHARD_FORMAT_VERSION = 2
+
+# Location of the manifest and shards in the built site
+SHARD_DIR = Path('search') / 'shards'
+
+# Search worker replacing the theme's Lunr worker, relative to the docs directory
+WORKER_PATH = 'javascripts/search-worker.js'
+
+# Copy of the unsharded index, relative to the directory of mkdocs.yml (read by the report)
+SOURCE_INDEX_COPY = Path('.cache') / 'search_shards' / 'search_index.json'
+
+# Worker URL in the theme's `__config` JSON, e.g. "../assets/javascripts/workers/search.2c215733.min.js"
+WORKER_URL_PATTERN: Pattern[str] = re.compile(
+    r'("search":\s*")([^"]*?)assets/javascripts/workers/search\.[0-9a-f]+\.min\.js"'
+)
+
+# Characters trimmed from both ends of a token (as the Lunr trimmer does)
+TRIM_PATTERN: Pattern[str] = re.compile(r'^\W+|\W+$')
+
+# HTML tags in the indexed text, removed from result teasers
+TAG_PATTERN: Pattern[str] = re.compile(r'<[^>]+>')
+
+# Words too common to be worth indexing (the search worker drops them from queries too)
+STOP_WORDS = frozenset((
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'has', 'in', 'is', 'it',
+    'its', 'of', 'on', 'or', 'that', 'the', 'this', 'to', 'was', 'were', 'will', 'with',
+))
+
+# BM25 parameters; title matches weigh as much as TITLE_BOOST occurrences in the text
+BM25_K1 = 1.2
+BM25_B = 0.75
+TITLE_BOOST = 10
+
+# Scores are stored as integers in hundredths
+SCORE_SCALE = 100
+
+# Characters of page text kept as the teaser shown under each result
+TEASER_LENGTH = 160
+
+# Shard of pages that no nav section lists
+OTHER_SECTION = 'Other'
+
+# Document shards larger than this are split by the next level of nav sections, where there is one
+DOC_SHARD_BYTES = 8 * 1024
+
+# Term shards are cut once they reach this size (a single term's postings may exceed it)
+TERM_SHARD_BYTES = 8 * 1024
+
+# Format of the log messages, for both the command line and the hooks
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+
+def tokenize(text: str, separator: Pattern[str]) -> List[str]:
+    """Split text into lowercase terms (mirrored by tokenize() in the search worker)"""
+    terms = []
+    for word in separator.split(text.lower()):
+        term = TRIM_PATTERN.sub('', word)
+        if len(term) > 1 and term not in STOP_WORDS:
+            terms.append(term)
+    return terms
+
+
+def shard_id(title: str) -> str:
+    """File name stem of the shard of a nav section"""
+    return re.sub(r'[^a-z0-9]+', '-', title.lower()).strip('-') or 'section'
+
+
+def make_teaser(text: str) -> str:
+    """Plain-text start of a document, cut at a word boundary"""
+    plain = ' '.join(html.unescape(TAG_PATTERN.sub(' ', text)).split())
+    if len(plain) <= TEASER_LENGTH:
+        return plain
+    return plain[:TEASER_LENGTH].rsplit(' ', 1)[0] + ' …'
+
+
+def encoded_size(value) -> int:
+    """Size of a value in the compact JSON the shards are written as"""
+    return len(json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+
+def build_shards(index: Dict, page_sections: Dict[str, Tuple[str, ...]]) -> Tuple[Dict, Dict[str, Dict]]:
+    """Split a stock search index into per-section document shards and term shards
+    
+    page_sections maps page URLs (as in the index locations, without the anchor) to the titles of
+    the nav sections containing them, outermost first. Documents are numbered shard by shard, so
+    every document shard holds a contiguous range. Postings are delta-coded [doc, score, ...] lists;
+    scores use document frequencies over the whole site. Returns the manifest (without shard
+    sizes) and the shards by id.
+    """
+    config = index.get('config', {})
+    separator = re.compile(config.get('separator', r'[\s\-]+'))
+    docs = index.get('docs', [])
+    
+    # The text of a page repeats the text of its sections, so pages with sections are only
+    # indexed by title; matching sections pull their page into the results
+    pages_with_sections = {doc.get('location', '').split('#', 1)[0] for doc in docs if '#' in doc.get('location', '')}
+    
+    # Term frequencies of every document, and document frequencies over the whole site
+    analyzed = []
+    document_frequency: Dict[str, int] = {}
+    for doc in docs:
+        text_terms: Dict[str, int] = {}
+        if doc.get('location', '') not in pages_with_sections:
+            for term in tokenize(doc.get('text', ''), separator):
+                text_terms[term] = text_terms.get(term, 0) + 1
+        title_terms = set(tokenize(doc.get('title', ''), separator))
+        for term in text_terms.keys() | title_terms:
+            document_frequency[term] = document_frequency.get(term, 0) + 1
+        page = doc.get('location', '').split('#', 1)[0]
+        section = tuple(page_sections.get(page, (OTHER_SECTION,)))
+        analyzed.append((doc, text_terms, title_terms, sum(text_terms.values()), section))
+    
+    total_docs = max(1, len(analyzed))
+    average_length = max(1.0, sum(entry[3] for entry in analyzed) / total_docs)
+    
+    def group(entries: List[Tuple], depth: int) -> Dict[Tuple[str, ...], List[Tuple]]:
+        groups: Dict[Tuple[str, ...], List[Tuple]] = {}
+        for entry in entries:
+            groups.setdefault(entry[4][:depth], []).append(entry)
+        return groups
+    
+    def doc_record(doc: Dict) -> List[str]:
+        return [doc.get('location', ''), doc.get('title', ''), make_teaser(doc.get('text', ''))]
+    
+    def split_pages(entries: List[Tuple]) -> List[List[Tuple]]:
+        # Runs of whole pages of at most DOC_SHARD_BYTES each (a single page may exceed it)
+        pages: Dict[str, List[Tuple]] = {}
+        for entry in entries:
+            pages.setdefault(entry[0].get('location', '').split('#', 1)[0], []).append(entry)
+        parts: List[List[Tuple]] = [[]]
+        part_bytes = 0
+        for page_entries in pages.values():
+            size = sum(encoded_size(doc_record(entry[0])) + 1 for entry in page_entries)
+            if parts[-1] and part_bytes + size > DOC_SHARD_BYTES:
+                parts.append([])
+                part_bytes = 0
+            parts[-1].extend(page_entries)
+            part_bytes += size
+        return parts
+    
+    def unique_id(identifier: str) -> str:
+        while identifier in shards:
+            identifier += '-'
+        return identifier
+    
+    shards: Dict[str, Dict] = {}
+    manifest_docs = []
+    postings: Dict[str, List[int]] = {}
+    last_doc: Dict[str, int] = {}
+    doc_number = 0
+    
+    # Document shards: the documents of each nav section (in index order), split by subsection while
+    # too large, and sections without subsections into runs of pages
+    parts: List[Tuple[Tuple[str, ...], str, List[Tuple]]] = []
+    pending = list(group(analyzed, 1).items())
+    while pending:
+        path, entries = pending.pop(0)
+        if encoded_size([doc_record(entry[0]) for entry in entries]) <= DOC_SHARD_BYTES:
+            parts.append((path, '', entries))
+            continue
+        subsections = group(entries, len(path) + 1)
+        if len(subsections) > 1:
+            pending[0:0] = subsections.items()
+        else:
+            pages = split_pages(entries)
+            parts.extend((path, f"-{number}" if len(pages) > 1 else '', part) for number, part in enumerate(pages, 1))
+    
+    for path, suffix, entries in parts:
+        title = ' › '.join(path)
+        identifier = unique_id(shard_id('-'.join(path)) + suffix)
+        shard_docs = [doc_record(entry[0]) for entry in entries]
+        shards[identifier] = {'version': SHARD_FORMAT_VERSION, 'section': title, 'docs': shard_docs}
+        manifest_docs.append({'id': identifier, 'title': title, 'start': doc_number, 'docs': len(shard_docs)})
+        
+        for _, text_terms, title_terms, length, _ in entries:
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * length / average_length)
+            for term in text_terms.keys() | title_terms:
+                frequency = text_terms.get(term, 0) + (TITLE_BOOST if term in title_terms else 0)
+                df = document_frequency[term]
+                idf = math.log(1 + (total_docs - df + 0.5) / (df + 0.5))
+                score = idf * frequency * (BM25_K1 + 1) / (frequency + norm)
+                postings.setdefault(term, []).extend((doc_number - last_doc.get(term, 0),
+                                                      max(1, round(score * SCORE_SCALE))))
+                last_doc[term] = doc_number
+            doc_number += 1
+    
+    # Term shards: consecutive ranges of the sorted terms, so the manifest routes a term by
+    # comparing it with the first term of each shard
+    manifest_terms = []
+    shard: Optional[Dict] = None
+    shard_bytes = 0
+    for term in sorted(postings):
+        size = encoded_size(term) + encoded_size(postings[term]) + 2
+        if shard is None or shard_bytes + size > TERM_SHARD_BYTES:
+            identifier = unique_id(f"terms-{len(manifest_terms)}")
+            shard = {'version': SHARD_FORMAT_VERSION, 'terms': [], 'postings': []}
+            shards[identifier] = shard
+            manifest_terms.append({'id': identifier, 'first': term})
+            shard_bytes = 0
+        shard['terms'].append(term)
+        shard['postings'].append(postings[term])
+        shard_bytes += size
+    
+    manifest = {
+        'version': SHARD_FORMAT_VERSION,
+        'config': {
+            'separator': separator.pattern,
+            'min_search_length': config.get('min_search_length', 3),
+            'stop_words': sorted(STOP_WORDS),
+        },
+        'doc_shards': manifest_docs,
+        'term_shards': manifest_terms,
+    }
+    return manifest, shards
+
+
+def write_shards(site_dir: Path, index: Dict, page_sections: Dict[str, Tuple[str, ...]]) -> Dict:
+    """Write the manifest and shards for a stock search index into a built site, returning the manifest"""
+    manifest, shards = build_shards(index, page_sections)
+    shard_dir = site_dir / SHARD_DIR
+    shard_dir.mkdir(parents=True, exist_ok=True)
+    for stale in shard_dir.glob('*.json'):
+        stale.unlink()
+    
+    for entry in manifest['doc_shards'] + manifest['term_shards']:
+        data = json.dumps(shards[entry['id']], ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        (shard_dir / f"{entry['id']}.json").write_bytes(data)
+        entry['bytes'] = len(data)
+    
+    manifest['source_bytes'] = encoded_size(index)
+    (shard_dir / 'manifest.json').write_text(json.dumps(manifest, ensure_ascii=False, separators=(',', ':')),
+                                             encoding='utf-8')
+    return manifest
+
+
+def term_shards_for(manifest: Dict, term: str) -> List[Dict]:
+    """Term shards that can hold terms starting with term (mirrored by termShardsFor() in the search worker)
+    
+    These are the shard whose range the term falls in and any following shards whose first term starts with it.
+    """
+    entries = manifest['term_shards']
+    firsts = [entry['first'] for entry in entries]
+    number = max(0, bisect_right(firsts, term) - 1)
+    selected = entries[number:number + 1]
+    for entry in entries[number + 1:]:
+        if not entry['first'].startswith(term):
+            break
+        selected.append(entry)
+    return selected
+
+
+def search(manifest: Dict, load_shard: Callable[[Dict], Dict], query: str, limit: int = 10) -> List[Dict]:
+    """Search the sharded index (the same algorithm as the search worker)
+    
+    load_shard(entry) returns the shard of a manifest entry and is called once per shard. The term
+    shards of every query term are loaded, then the document shards of the matching documents.
+    Returns matching documents by descending score.
+    """
+    loaded: Dict[str, Dict] = {}
+    
+    def shard_of(entry: Dict) -> Dict:
+        if entry['id'] not in loaded:
+            loaded[entry['id']] = load_shard(entry)
+        return loaded[entry['id']]
+    
+    config = manifest['config']
+    separator = re.compile(config['separator'])
+    terms = list(dict.fromkeys(tokenize(query, separator)))
+    if len(query.strip()) < config['min_search_length'] or not terms:
+        return []
+    
+    scores: Optional[Dict[int, int]] = None
+    for term in terms:
+        # Every query term matches as a prefix; exact matches count double
+        term_scores: Dict[int, int] = {}
+        for entry in term_shards_for(manifest, term):
+            shard = shard_of(entry)
+            position = bisect_left(shard['terms'], term)
+            while position < len(shard['terms']) and shard['terms'][position].startswith(term):
+                weight = 2 if shard['terms'][position] == term else 1
+                postings = shard['postings'][position]
+                doc = 0
+                for i in range(0, len(postings), 2):
+                    doc += postings[i]
+                    term_scores[doc] = term_scores.get(doc, 0) + postings[i + 1] * weight
+                position += 1
+        scores = term_scores if scores is None else {
+            doc: score + term_scores[doc] for doc, score in scores.items() if doc in term_scores
+        }
+        if not scores:
+            return []
+    
+    doc_entries = manifest['doc_shards']
+    starts = [entry['start'] for entry in doc_entries]
+    results = []
+    for doc, score in scores.items():
+        entry = doc_entries[bisect_right(starts, doc) - 1]
+        location, title, teaser = shard_of(entry)['docs'][doc - entry['start']]
+        results.append({'location': location, 'title': title, 'text': teaser, 'score': score})
+    
+    results.sort(key=lambda result: -result['score'])
+    return results[:limit]
+
+
+# MkDocs hooks
+#
+# mkdocs.yml registers this module under `hooks:`. After the stock search plugin has written
+# search/search_index.json, the index is sharded by nav section and replaced by a stub, and every
+# page is pointed at the sharded search worker. Set DISABLE_SEARCH_SHARDS=true to keep the
+# stock search.
+
+# Nav section titles (outermost first) of each page URL, recorded by on_nav
+_page_sections: Dict[str, Tuple[str, ...]] = {}
+
+# Whether the current build shards the index (search plugin enabled and not disabled)
+_sharding_enabled: bool = False
+
+
+def _search_shards_disabled() -> bool:
+    """Check whether search sharding has been disabled through the environment"""
+    return os.environ.get('DISABLE_SEARCH_SHARDS', '').lower() in ('1', 'true', 'yes')
+
+
+def on_config(config):
+    """Enable sharding when the search plugin is in use"""
+    global _sharding_enabled
+    
+    # MkDocs only handles its own loggers; no-op if logging was configured already
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+    
+    search_enabled = any(name == 'search' or name.endswith('/search') for name in config['plugins'])
+    _sharding_enabled = search_enabled and not _search_shards_disabled()
+    return config
+
+
+def on_nav(nav, config, files):
+    """Record the nav sections containing every page
+    
+    The Home section repeats the overview pages of the other sections, so a page listed in
+    several sections belongs to the last one.
+    """
+    _page_sections.clear()
+    
+    def collect(items, path: Tuple[str, ...]) -> None:
+        for item in items:
+            if item.is_page:
+                _page_sections[item.url] = path
+            elif item.is_section:
+                collect(item.children, path + (item.title,))
+    
+    for item in nav.items:
+        if item.is_section:
+            collect(item.children, (item.title,))
+        elif item.is_page:
+            _page_sections[item.url] = (item.title or OTHER_SECTION,)
+    return nav
+
+
+def _use_sharded_worker(output: str) -> str:
+    """Point the theme configuration of a rendered page at the sharded search worker"""
+    if not _sharding_enabled:
+        return output
+    return WORKER_URL_PATTERN.sub(lambda match: f'{match[1]}{match[2]}{WORKER_PATH}"', output, count=1)
+
+
+def on_post_page(output, page, config):
+    """Make each page use the sharded search worker"""
+    return _use_sharded_worker(output)
+
+
+def on_post_template(output_content, template_name, config):
+    """Make static templates (e.g. 404.html) use the sharded search worker"""
+    return _use_sharded_worker(output_content)
+
+
+def on_post_build(config) -> None:
+    """Shard the search index written by the search plugin and replace it with a stub"""
+    if not _sharding_enabled:
+        return
+    
+    site_dir = Path(config['site_dir'])
+    index_path = site_dir / 'search' / 'search_index.json'
+    if not index_path.exists():
+        logger.warning(f"Search sharding skipped: {index_path} not found")
+        return
+    
+    start = time.perf_counter()
+    with open(index_path, 'r', encoding='utf-8') as f:
+        index = json.load(f)
+    
+    # Keep the full index for the report; the sharded worker never reads it
+    source_copy = Path(config['config_file_path']).resolve().parent / SOURCE_INDEX_COPY
+    source_copy.parent.mkdir(parents=True, exist_ok=True)
+    source_copy.write_text(json.dumps(index, ensure_ascii=False, separators=(',', ':')), encoding='utf-8')
+    
+    manifest = write_shards(site_dir, index, _page_sections)
+    index_path.write_text(json.dumps({'config': index.get('config', {}), 'docs': []}), encoding='utf-8')
+    
+    doc_sizes = [entry['bytes'] for entry in manifest['doc_shards']]
+    term_sizes = [entry['bytes'] for entry in manifest['term_shards']]
+    manifest_bytes = (site_dir / SHARD_DIR / 'manifest.json').stat().st_size
+    logger.info(f"Search index: {len(index.get('docs', []))} documents in {len(doc_sizes)} section shards "
+                f"({sum(doc_sizes) / 1024:.1f} KB) and {len(term_sizes)} term shards "
+                f"({sum(term_sizes) / 1024:.1f} KB), manifest {manifest_bytes / 1024:.1f} KB, instead of {manifest['source_bytes'] / 1024:.1f} KB "
+                f"in one file, in {time.perf_counter() - start:.2f}s")
+
+
+def report(site_dir: Path, source_index: Path, queries: List[str], repeat: int) -> Dict:
+    """Measure the bytes each query downloads and the time to its first result
+    
+    Bytes are what the search worker fetches (the manifest plus the shards it loads), against the
+    monolithic index the stock worker downloads before its first search. Times are for this Python
+    implementation (parsing the JSON it loads and searching), a rough proxy for the worker.
+    """
+    shard_dir = site_dir / SHARD_DIR
+    manifest_bytes = (shard_dir / 'manifest.json').read_bytes()
+    manifest = json.loads(manifest_bytes)
+    
+    shard_bytes = {entry['id']: entry['bytes'] for entry in manifest['doc_shards'] + manifest['term_shards']}
+    results = {
+        'manifest_bytes': len(manifest_bytes),
+        'doc_shard_bytes': {entry['id']: entry['bytes'] for entry in manifest['doc_shards']},
+        'term_shard_bytes': sum(entry['bytes'] for entry in manifest['term_shards']),
+        'term_shards': len(manifest['term_shards']),
+        'monolithic_bytes': source_index.stat().st_size,
+        'queries': {},
+    }
+    for query in queries:
+        times = []
+        for _ in range(repeat):
+            loaded: List[str] = []
+            
+            def load_shard(entry: Dict) -> Dict:
+                loaded.append(entry['id'])
+                return json.loads((shard_dir / f"{entry['id']}.json").read_bytes())
+            
+            start = time.perf_counter()
+            found = search(json.loads(manifest_bytes), load_shard, query)
+            times.append(time.perf_counter() - start)
+        
+        downloaded = len(manifest_bytes) + sum(shard_bytes[shard] for shard in loaded)
+        results['queries'][query] = {
+            'first_result': found[0]['location'] if found else None,
+            'shards_loaded': loaded,
+            'bytes': downloaded,
+            'fraction_of_monolithic': round(downloaded / max(1, results['monolithic_bytes']), 3),
+            'first_result_s': round(min(times), 6),
+        }
+    return results
+
+
+def main() -> int:
+    """Main entry point"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Report the bytes downloaded per query and time to first result '
+                                                 'of the sharded search index')
+    parser.add_argument('queries', nargs='*', default=['ultrasound', 'robot', 'install', 'policy training'],
+                        help='Queries to measure (default: a few common ones)')
+    parser.add_argument('--site', type=Path, default=Path('site'), help='Built site directory (default: site)')
+    parser.add_argument('--source-index', type=Path, default=SOURCE_INDEX_COPY,
+                        help=f'Unsharded index saved by the build (default: {SOURCE_INDEX_COPY})')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed runs per query (default: 5)')
+    parser.add_argument('--json', type=Path, metavar='PATH', help="Write results as JSON to PATH ('-' for stdout)")
+    args = parser.parse_args()
+    
+    if not (args.site / SHARD_DIR / 'manifest.json').exists() or not args.source_index.exists():
+        print(f"Error: no sharded index in {args.site} (run `mkdocs build` with the search_shards hook first)")
+        return 1
+    
+    results = report(args.site, args.source_index, args.queries, max(1, args.repeat))
+    
+    # The table goes to stderr when stdout carries the JSON results
+    table = sys.stderr if args.json == Path('-') else sys.stdout
+    doc_bytes = results['doc_shard_bytes']
+    print(f"Monolithic index: {results['monolithic_bytes'] / 1024:.1f} KB; "
+          f"manifest {results['manifest_bytes'] / 1024:.1f} KB, "
+          f"{results['term_shards']} term shards {results['term_shard_bytes'] / 1024:.1f} KB, "
+          f"{len(doc_bytes)} section shards {sum(doc_bytes.values()) / 1024:.1f} KB "
+          f"(largest {max(doc_bytes.values(), default=0) / 1024:.1f} KB)", file=table)
+    print(f"{'query':<24} {'shards':>6} {'KB':>8} {'of mono':>8} {'first result (ms)':>18}  first result", file=table)
+    for query, result in results['queries'].items():
+        print(f"{query:<24} {len(result['shards_loaded']):>6} {result['bytes'] / 1024:>8.1f} "
+              f"{result['fraction_of_monolithic']:>8.0%} {result['first_result_s'] * 1000:>18.2f}  "
+              f"{result['first_result']}", file=table)
+    
+    if args.json:
+        output = json.dumps(results, indent=2, sort_keys=True)
+        if args.json == Path('-'):
+            print(output)
+        else:
+            args.json.write_text(output + '\n', encoding='utf-8')
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Sparse Working Trees for the Source Repositories
+
+Limits the working tree of a local git repository to an explicit list of files
+(non-cone sparse checkout) and extends the list as more files are needed. Combined
+with a partial clone, only the blobs of the listed files are ever downloaded:
+
+    git clone --filter=blob:none --no-checkout https://github.com/isaac-for-healthcare/i4h-workflows.git
+
+Repositories cloned with --no-checkout are checked out when the sparse set is first
+applied. `git sparse-checkout disable` restores the full working tree.
+"""
+
+import subprocess
+import threading
+from pathlib import Path
+from typing import Iterable, List, Optional, Set
+
+# Characters with a special meaning in sparse-checkout (gitignore-style) patterns
+_PATTERN_SPECIAL = set('\\*?[!#')
+
+
+class SparseCheckoutError(RuntimeError):
+    """A git command managing a sparse checkout failed"""
+
+
+def is_git_repository(path: Path) -> bool:
+    """Check whether path is the top level of a git working tree (or a --no-checkout clone)"""
+    return (Path(path) / '.git').exists()
+
+
+def path_pattern(path: str) -> str:
+    """Return the non-cone sparse-checkout pattern matching exactly one repository file"""
+    escaped = ''.join('\\' + c if c in _PATTERN_SPECIAL else c for c in path)
+    return '/' + escaped
+
+
+class SparseCheckout:
+    """Sparse working tree of a local git repository that only contains explicitly listed files
+    
+    Safe to extend from several threads; each extension is one `git sparse-checkout add`.
+    """
+    
+    def __init__(self, repo_path: Path):
+        self.repo_path: Path = Path(repo_path)
+        self._lock = threading.Lock()
+        self._tracked: Optional[Set[str]] = None
+        self._paths: Set[str] = set()
+    
+    def _git(self, *args: str, input: Optional[str] = None) -> str:
+        """Run a git command in the repository and return its output"""
+        result = subprocess.run(['git', '-C', str(self.repo_path), *args], input=input,
+                                capture_output=True, text=True)
+        if result.returncode != 0:
+            raise SparseCheckoutError(f"git {' '.join(args)} failed in {self.repo_path}: {result.stderr.strip()}")
+        return result.stdout
+    
+    def _index_path(self) -> Path:
+        """Path of the repository's index file, which a --no-checkout clone does not have yet"""
+        index_path = Path(self._git('rev-parse', '--git-path', 'index').strip())
+        return index_path if index_path.is_absolute() else self.repo_path / index_path
+    
+    def tracked_files(self) -> Set[str]:
+        """Files of the checked-out commit, as paths relative to the repository (read from the tree, not the disk)"""
+        if self._tracked is None:
+            output = self._git('ls-tree', '-r', '-z', '--name-only', 'HEAD')
+            self._tracked = set(filter(None, output.split('\0')))
+        return self._tracked
+    
+    @property
+    def paths(self) -> Set[str]:
+        """Files currently in the sparse set"""
+        return set(self._paths)
+    
+    def apply(self, paths: Iterable[str]) -> List[str]:
+        """Replace the sparse set with the given files and update the working tree
+        
+        Paths that are not tracked in the repository are ignored. Returns the files in the new set.
+        """
+        with self._lock:
+            tracked = self.tracked_files()
+            selected = sorted({path for path in paths if path in tracked})
+            has_index = self._index_path().exists()
+            self._git('sparse-checkout', 'set', '--no-cone', '--stdin',
+                      input=''.join(path_pattern(path) + '\n' for path in selected))
+            if not has_index:
+                # A --no-checkout clone has no index yet, so nothing was materialized
+                self._git('checkout', '--quiet')
+            self._paths = set(selected)
+        return selected
+    
+    def add(self, paths: Iterable[str]) -> List[str]:
+        """Add files to the sparse set and materialize them, returning the ones that were added
+        
+        Paths that are untracked or already in the set are skipped, so repeated calls are cheap.
+        """
+        with self._lock:
+            tracked = self.tracked_files()
+            added = sorted({path for path in paths if path in tracked and path not in self._paths})
+            if added:
+                self._git('sparse-checkout', 'add', '--stdin',
+                          input=''.join(path_pattern(path) + '\n' for path in added))
+                self._paths.update(added)
+        return added
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Cached Loading of the README Sync Configuration
+
+Parsing YAML (and importing PyYAML) dominates the startup time of the
+documentation scripts, so parsed configs are memoized in memory by path and
+mtime, and persisted as JSON so later processes skip the YAML parser entirely.
+
+`load_sync_config()` validates readme-sync-config.yml once per modification and
+returns a `SyncConfig` with the views that sync_readmes.py (and its MkDocs
+hooks) and license_header_validator.py need.
+"""
+
+import copy
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from atomic_output import atomic_write_text
+
+# Default location of the sync configuration, relative to the repository root
+DEFAULT_CONFIG_PATH = Path('scripts/readme-sync-config.yml')
+
+# Parsed copies of the YAML config, relative to the repository root
+DEFAULT_CACHE_DIR = Path('.cache/config')
+
+# Parsed configs of this process: resolved path -> (size, mtime_ns, data)
+_memo: Dict[str, Tuple[int, int, Any]] = {}
+
+# Validated sync configs of this process: resolved path -> (size, mtime_ns, config)
+_sync_configs: Dict[str, Tuple[int, int, 'SyncConfig']] = {}
+
+# Version names become directories under docs/
+VERSION_NAME_PATTERN = re.compile(r'[A-Za-z0-9][A-Za-z0-9._-]*')
+
+# Directories of docs/ that a version name must not shadow
+RESERVED_VERSION_NAMES = frozenset({'assets', 'javascripts', 'stylesheets'})
+
+
+def _parse_yaml(path: Path) -> Any:
+    """Parse a YAML file, with the libyaml-based loader when PyYAML was built with it"""
+    import yaml
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    with open(path, 'r', encoding='utf-8') as f:
+        return yaml.load(f, Loader=loader)
+
+
+def load_yaml_cached(path: Path, cache_dir: Optional[Path] = None) -> Any:
+    """Load a YAML file, reusing the parsed result for as long as the file's size and mtime are unchanged
+    
+    With cache_dir the parsed result is also stored there as JSON, which later processes load
+    without importing PyYAML. The returned data is shared between callers and must not be modified.
+    """
+    path = Path(path)
+    st = path.stat()
+    key = os.path.abspath(path)
+    
+    cached = _memo.get(key)
+    if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+        return cached[2]
+    
+    cache_file = None
+    data = None
+    if cache_dir is not None:
+        cache_file = Path(cache_dir) / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()[:16]}.json"
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            if entry.get('size') == st.st_size and entry.get('mtime_ns') == st.st_mtime_ns:
+                data = entry['data']
+        except (OSError, ValueError, KeyError):
+            pass
+    
+    if data is None:
+        data = _parse_yaml(path)
+        if cache_file is not None:
+            try:
+                atomic_write_text(cache_file, json.dumps({'size': st.st_size, 'mtime_ns': st.st_mtime_ns,
+                                                          'data': data}))
+            except (OSError, TypeError):
+                pass  # The in-memory result is still valid; values JSON cannot represent are not persisted
+    
+    _memo[key] = (st.st_size, st.st_mtime_ns, data)
+    return data
+
+
+class ConfigError(ValueError):
+    """The sync configuration is malformed"""
+
+
+class SyncConfig:
+    """Validated README sync configuration with precomputed views
+    
+    Instances are shared between callers (see load_sync_config) and must not be modified.
+    """
+    
+    def __init__(self, path: Path, data: Any, content_hash: str):
+        self.path: Path = Path(path)
+        self.data: Dict = data if data is not None else {}
+        # Hash of the file contents, part of the sync cache key
+        self.content_hash: str = content_hash
+        if not isinstance(self.data, dict):
+            raise ConfigError(f"{self.path}: expected a mapping at the top level")
+        
+        thresholds = self._mapping('content_thresholds')
+        self.min_content_length: int = self._int(thresholds, 'content_thresholds.minimum_length', 500)
+        self.critical_threshold: int = self._int(thresholds, 'content_thresholds.critical_threshold', 100)
+        
+        self.repo_urls: Dict[str, str] = dict(self._mapping('repository_urls'))
+        
+        # Repository name -> (source, target) pairs of its main README and sub-READMEs, in config order
+        self.readmes: Dict[str, Tuple[Tuple[str, str], ...]] = {}
+        # Target page -> source README, over all repositories
+        self.target_map: Dict[str, str] = {}
+        # Repository name -> git ref its files are read at (instead of its working tree)
+        self.repo_refs: Dict[str, str] = {}
+        repositories = self.data.get('repositories') or []
+        if not isinstance(repositories, list):
+            raise ConfigError(f"{self.path}: 'repositories' must be a list")
+        for index, repo_config in enumerate(repositories):
+            if not isinstance(repo_config, dict) or not isinstance(repo_config.get('name'), str):
+                raise ConfigError(f"{self.path}: repositories[{index}] needs a 'name'")
+            name = repo_config['name']
+            if name in self.readmes:
+                raise ConfigError(f"{self.path}: repository '{name}' is listed twice")
+            if 'ref' in repo_config:
+                if not isinstance(repo_config['ref'], str) or not repo_config['ref']:
+                    raise ConfigError(f"{self.path}: 'ref' of repository '{name}' must be a branch, tag or commit")
+                self.repo_refs[name] = repo_config['ref']
+            entries = []
+            readmes = ([repo_config['main_readme']] if 'main_readme' in repo_config else [])
+            readmes += repo_config.get('sub_readmes') or []
+            for readme in readmes:
+                if not (isinstance(readme, dict) and isinstance(readme.get('source'), str)
+                        and isinstance(readme.get('target'), str)):
+                    raise ConfigError(f"{self.path}: every README of '{name}' needs a 'source' and a 'target'")
+                source, target = readme['source'], readme['target']
+                if target in self.target_map:
+                    raise ConfigError(f"{self.path}: target '{target}' is configured more than once")
+                self.target_map[target] = source
+                entries.append((source, target))
+            self.readmes[name] = tuple(entries)
+        
+        # (source, target) pairs of every configured README, in config order
+        self.entries: Tuple[Tuple[str, str], ...] = tuple(pair for pairs in self.readmes.values() for pair in pairs)
+        
+        # Repository names in config order, and the directories the license validator skips
+        self.repo_names: Tuple[str, ...] = tuple(self.readmes)
+        self.exclude_dirs: FrozenSet[str] = frozenset(self.readmes) | frozenset(self.repo_urls)
+        
+        self.assets: Dict = self._mapping('assets')
+        self.asset_store: str = self.assets.get('store', 'basename')
+        self.asset_link: str = self.assets.get('link', 'copy')
+        if self.asset_store not in ('basename', 'content-addressed'):
+            raise ConfigError(f"{self.path}: unknown assets.store '{self.asset_store}' "
+                              f"(expected 'basename' or 'content-addressed')")
+        if self.asset_link not in ('copy', 'hardlink'):
+            raise ConfigError(f"{self.path}: unknown assets.link '{self.asset_link}' (expected 'copy' or 'hardlink')")
+        
+        # Documentation versions, each synced from its own refs into docs/<name>/, in config order
+        self.versions: Tuple[Dict, ...] = self._versions()
+    
+    def _versions(self) -> Tuple[Dict, ...]:
+        versions = self.data.get('versions') or []
+        if not isinstance(versions, list):
+            raise ConfigError(f"{self.path}: 'versions' must be a list")
+        
+        parsed: List[Dict] = []
+        for index, version in enumerate(versions):
+            name = version.get('name') if isinstance(version, dict) else None
+            if not isinstance(name, str) or not VERSION_NAME_PATTERN.fullmatch(name):
+                raise ConfigError(f"{self.path}: versions[{index}] needs a 'name' made of letters, digits, '.', '_' and '-'")
+            if name in RESERVED_VERSION_NAMES or any(v['name'] == name for v in parsed):
+                raise ConfigError(f"{self.path}: version name '{name}' is reserved or listed twice")
+            
+            # One ref for every repository, optionally overridden per repository
+            refs = version.get('refs') or {}
+            if not isinstance(refs, dict) or not all(isinstance(ref, str) and ref for ref in refs.values()):
+                raise ConfigError(f"{self.path}: 'refs' of version '{name}' must map repositories to refs")
+            unknown = sorted(set(refs) - set(self.readmes))
+            if unknown:
+                raise ConfigError(f"{self.path}: 'refs' of version '{name}' names unknown repositories: "
+                                  f"{', '.join(unknown)}")
+            default_ref = version.get('ref')
+            if default_ref is not None and not (isinstance(default_ref, str) and default_ref):
+                raise ConfigError(f"{self.path}: 'ref' of version '{name}' must be a branch, tag or commit")
+            missing = [repo for repo in self.readmes if repo not in refs and default_ref is None]
+            if missing:
+                raise ConfigError(f"{self.path}: version '{name}' has no ref for {', '.join(missing)}")
+            
+            aliases = version.get('aliases') or []
+            if not isinstance(aliases, list) or not all(isinstance(alias, str) for alias in aliases):
+                raise ConfigError(f"{self.path}: 'aliases' of version '{name}' must be a list of names")
+            parsed.append({
+                'name': name,
+                'title': str(version.get('title', name)),
+                'aliases': list(aliases),
+                'refs': {repo: refs.get(repo, default_ref) for repo in self.readmes},
+            })
+        
+        for target in self.target_map:
+            if parsed and not target.startswith('docs/'):
+                raise ConfigError(f"{self.path}: versioned sync needs every target under docs/, got '{target}'")
+        return tuple(parsed)
+    
+    def for_version(self, name: str) -> 'SyncConfig':
+        """Return the configuration of one version: targets moved to docs/<name>/ and every repository read at its ref"""
+        version = next((v for v in self.versions if v['name'] == name), None)
+        if version is None:
+            raise ConfigError(f"{self.path}: unknown version '{name}' "
+                              f"(configured: {', '.join(v['name'] for v in self.versions) or 'none'})")
+        
+        data = copy.deepcopy(self.data)
+        data.pop('versions', None)
+        for repo_config in data.get('repositories') or []:
+            repo_config['ref'] = version['refs'][repo_config['name']]
+            readmes = ([repo_config['main_readme']] if 'main_readme' in repo_config else [])
+            for readme in readmes + (repo_config.get('sub_readmes') or []):
+                readme['target'] = f"docs/{name}/{readme['target'][len('docs/'):]}"
+        
+        content_hash = hashlib.sha256(f"{self.content_hash}:{name}".encode('utf-8')).hexdigest()
+        return SyncConfig(self.path, data, content_hash)
+    
+    def _mapping(self, key: str) -> Dict:
+        value = self.data.get(key) or {}
+        if not isinstance(value, dict):
+            raise ConfigError(f"{self.path}: '{key}' must be a mapping")
+        return value
+    
+    def _int(self, mapping: Dict, key: str, default: int) -> int:
+        value = mapping.get(key.rsplit('.', 1)[-1], default)
+        if not isinstance(value, int) or isinstance(value, bool):
+            raise ConfigError(f"{self.path}: '{key}' must be an integer")
+        return value
+
+
+def load_sync_config(path: Path = DEFAULT_CONFIG_PATH, cache_dir: Optional[Path] = DEFAULT_CACHE_DIR) -> SyncConfig:
+    """Load and validate the sync configuration, reusing the result while the file is unmodified
+    
+    Callers can compare the returned object with `is` to detect a changed configuration.
+    Raises ConfigError if the configuration is malformed.
+    """
+    path = Path(path)
+    st = path.stat()
+    key = os.path.abspath(path)
+    
+    cached = _sync_configs.get(key)
+    if cached and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+        return cached[2]
+    
+    config = SyncConfig(path, load_yaml_cached(path, cache_dir), hashlib.sha256(path.read_bytes()).hexdigest())
+    _sync_configs[key] = (st.st_size, st.st_mtime_ns, config)
+    return config
@@ -22,61 +22,983 @@ This script synchronizes README.md files from the i4h-* repositories into the ma
 documentation system with proper attribution and image handling.
 """
 
-import argparse
+# This module is also loaded as an MkDocs hook on every `mkdocs build`/`mkdocs serve` start, so
+# modules that are only needed by some code paths (PyYAML, Pillow, thread pools, argparse, ...)
+# are imported where they are used, and logging is configured in main(). The sibling modules in
+# scripts/ are cheap and imported at the top: MkDocs only puts scripts/ on sys.path while it
+# imports the hook, so importing them later fails.
+
+import hashlib
+import itertools
+import json
 import logging
 import os
 import re
-import shutil
+import threading
 import time
-from datetime import datetime
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, List, Optional, Pattern, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Pattern, Set, Tuple
 
-import yaml
+from atomic_output import OutputTransaction, atomic_write_bytes, atomic_write_text
+from git_source import GitSource
+from image_optimizer import ImageOptimizer, pillow_available
+from sparse_checkout import SparseCheckout, is_git_repository
+from sync_config import ConfigError, SyncConfig, load_sync_config
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# All image syntaxes are matched by a single alternation so a document is scanned (and rewritten) in one pass
+IMAGE_PATTERN: Pattern[str] = re.compile(
+    r'!\[(?P<alt>[^\]]*)\]\((?P<md_path>[^)]+)\)'  # Markdown image syntax: ![alt](path)
+    r'|<img\s+(?:[^>]*\s)?src=(?:"(?P<dq_path>[^"]+)"'  # HTML img tags: <img src="path" ...>
+    r"|'(?P<sq_path>[^']+)')"  # HTML img tags with single quotes
+)
+
+# Images and links are rewritten together, in one pass over each synced README. The
+# image alternatives come first so that '![alt](path)' is never taken for a link.
+REFERENCE_PATTERN: Pattern[str] = re.compile(
+    r'(?=[!<\[])(?:'  # Cheap first-character check before trying the alternatives
+    + IMAGE_PATTERN.pattern
+    + r'|(?<!!)\[(?:[^\[\]]|\[[^\]]*\])*\]\((?P<link_path>[^)\s]+)[^)]*\)'  # Markdown links: [text](path "title")
+    + r'|<a\s+(?:[^>]*\s)?href=(?:"(?P<dq_href>[^"]+)"'  # HTML links: <a href="path" ...>
+    + r"|'(?P<sq_href>[^']+)'))"  # HTML links with single quotes
+)
+
+# References to files in docs/assets/images, as written by the image rewriting
+ASSET_REF_PATTERN: Pattern[str] = re.compile(r'assets/images/([^\s)"\'#?]+)')
+
+# Links with a URL scheme (mailto:, ftp:, ...) are never rewritten
+URL_SCHEME_PATTERN: Pattern[str] = re.compile(r'[A-Za-z][A-Za-z0-9+.-]*:')
+
+# Markdown links in titles, reduced to their text
+MARKDOWN_LINK_PATTERN: Pattern[str] = re.compile(r'\[([^\]]+)\]\([^)]+\)')
+
+# Markdown link reference definitions: [id]: path "title" (or [id]: <path>)
+LINK_DEFINITION_PATTERN: Pattern[str] = re.compile(
+    r'^ {0,3}\[(?:[^\[\]\\\n]|\\.)+\]:[ \t]*(?:<(?P<angle_path>[^<>\n]+)>|(?P<def_path>[^\s<]\S*))',
+    re.MULTILINE
+)
+
+# Opening/closing line of a fenced code block: up to 3 spaces of indentation, then ``` or ~~~
+FENCE_PATTERN: Pattern[str] = re.compile(r'^ {0,3}(`{3,}|~{3,})(.*)$')
+
+# Timestamp line of the documentation needs report, ignored when checking whether the report changed
+REPORT_TIMESTAMP_PATTERN: Pattern[str] = re.compile(r'^Generated: .*$', re.MULTILINE)
+
+# Version of the sync output format. Bump this whenever a change to this script
+# alters the generated pages so that cached results from older runs are discarded.
+SYNC_SCRIPT_VERSION = '5'
+
+# File extensions of content-addressed assets, by source extension where they differ
+ASSET_SUFFIXES: Dict[str, str] = {'.jpeg': '.jpg'}
+
+
+def _fenced_lines(lines: Iterable[str]) -> Iterator[Tuple[str, bool]]:
+    """Yield each markdown line with whether it belongs to a fenced code block (fence lines included)"""
+    fence: Optional[str] = None
+    for line in lines:
+        fence_match = FENCE_PATTERN.match(line)
+        if fence is not None:
+            # Inside a code block until a fence of the same kind and at least the same length
+            marker = fence_match.group(1) if fence_match else ''
+            if marker[:1] == fence[0] and len(marker) >= len(fence) and not fence_match.group(2).strip():
+                fence = None
+            yield line, True
+        elif fence_match:
+            fence = fence_match.group(1)
+            yield line, True
+        else:
+            yield line, False
+
+
+def _markdown_chunks(content: str) -> Iterator[Tuple[str, bool]]:
+    """Split markdown into runs of lines outside and inside fenced code blocks, with whether they are code"""
+    for in_code, lines in itertools.groupby(_fenced_lines(content.splitlines(keepends=True)), key=lambda item: item[1]):
+        yield ''.join(line for line, _ in lines), in_code
+
+
+class _ThreadLogBuffer(logging.Filter):
+    """Logging filter that diverts records from worker threads into per-task buffers"""
+    
+    def __init__(self):
+        super().__init__()
+        self._local = threading.local()
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        buffer = getattr(self._local, 'buffer', None)
+        if buffer is None:
+            return True
+        buffer.append(record)
+        return False
+    
+    def capture(self, func: Callable, *args) -> Tuple[Any, List[logging.LogRecord]]:
+        """Run func on the current thread and return its result and the log records it emitted"""
+        records: List[logging.LogRecord] = []
+        self._local.buffer = records
+        try:
+            result = func(*args)
+        finally:
+            self._local.buffer = None
+        return result, records
+
+
+_log_buffer = _ThreadLogBuffer()
+logger.addFilter(_log_buffer)
+# Workers also log through the image optimizer (e.g. skipped images), grouped with their own lines
+logging.getLogger(ImageOptimizer.__module__).addFilter(_log_buffer)
+
+
+class _PollingWatcher:
+    """Detect changes to a set of files by polling their stat"""
+    
+    def __init__(self, interval: float = 0.5):
+        self.interval = interval
+    
+    @staticmethod
+    def _snapshot(paths: Iterable[Path]) -> Dict[Path, Optional[Tuple[int, int]]]:
+        snapshot = {}
+        for path in paths:
+            try:
+                st = path.stat()
+                snapshot[path] = (st.st_size, st.st_mtime_ns)
+            except OSError:
+                snapshot[path] = None
+        return snapshot
+    
+    def wait(self, paths: Set[Path], debounce: float) -> Set[Path]:
+        """Block until some of the paths change and no further change happens for debounce seconds"""
+        before = self._snapshot(paths)
+        changed: Set[Path] = set()
+        last_change = 0.0
+        
+        while True:
+            time.sleep(self.interval)
+            after = self._snapshot(paths)
+            newly_changed = {path for path in paths if after[path] != before[path]}
+            before = after
+            
+            if newly_changed:
+                changed |= newly_changed
+                last_change = time.monotonic()
+            elif changed and time.monotonic() - last_change >= debounce:
+                return changed
+    
+    def close(self) -> None:
+        pass
+
+
+class _InotifyWatcher:
+    """Detect changes to a set of files with watchdog (inotify on Linux), watching only their directories"""
+    
+    def __init__(self):
+        import queue
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+        
+        self._empty = queue.Empty
+        events: queue.Queue = queue.Queue()
+        
+        class Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                # Ignore open/close-without-write events caused by reading the sources
+                if event.event_type not in ('created', 'modified', 'moved', 'deleted', 'closed'):
+                    return
+                events.put(Path(event.src_path))
+                # Editors often save by renaming a temporary file over the original
+                dest_path = getattr(event, 'dest_path', None)
+                if dest_path:
+                    events.put(Path(dest_path))
+        
+        self._events = events
+        self._handler = Handler()
+        self._observer = Observer()
+        self._watched_dirs: Dict[Path, object] = {}
+        self._observer.start()
+    
+    def _watch_dirs(self, dirs: Set[Path]) -> None:
+        for directory in set(self._watched_dirs) - dirs:
+            self._observer.unschedule(self._watched_dirs.pop(directory))
+        for directory in dirs - set(self._watched_dirs):
+            if directory.is_dir():
+                self._watched_dirs[directory] = self._observer.schedule(self._handler, str(directory), recursive=False)
+    
+    def wait(self, paths: Set[Path], debounce: float) -> Set[Path]:
+        """Block until some of the paths change and no further event arrives for debounce seconds"""
+        self._watch_dirs({path.parent for path in paths})
+        changed: Set[Path] = set()
+        
+        while True:
+            try:
+                path = self._events.get(timeout=debounce if changed else None)
+            except self._empty:
+                return changed
+            if path in paths:
+                changed.add(path)
+    
+    def close(self) -> None:
+        self._observer.stop()
+        self._observer.join()
+
+
+class SyncMetrics:
+    """Per-phase and per-file timings plus byte counters collected during a sync run
+    
+    Phase times are summed over all threads, so with --jobs > 1 they can exceed the wall time.
+    Nested phases are counted in full (e.g. 'copy_images' time is also part of 'rewrite_references').
+    """
+    
+    def __init__(self):
+        from datetime import datetime
+        self.started_at: str = datetime.now().isoformat()
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.phases: Dict[str, Dict[str, float]] = {}
+        self.counters: Dict[str, int] = {'bytes_read': 0, 'bytes_written': 0}
+        self.files: List[Dict] = []
+    
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a block of work under the given phase name"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                phase = self.phases.setdefault(name, {'seconds': 0.0, 'calls': 0})
+                phase['seconds'] += elapsed
+                phase['calls'] += 1
+    
+    @contextmanager
+    def file(self, source: str, target: str) -> Iterator[Dict]:
+        """Time the processing of one README; bytes counted on this thread meanwhile are attributed to it"""
+        record = {'source': source, 'target': target, 'result': None, 'bytes_read': 0, 'bytes_written': 0}
+        self._local.file = record
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record['seconds'] = time.perf_counter() - start
+            self._local.file = None
+            with self._lock:
+                self.files.append(record)
+    
+    def count(self, key: str, amount: int = 1) -> None:
+        """Increment a counter; bytes_read/bytes_written are also added to the current file"""
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+        record = getattr(self._local, 'file', None)
+        if record is not None and key in record:
+            record[key] += amount
+    
+    def to_dict(self, stats: Dict, options: Dict) -> Dict:
+        """Build the JSON-serializable metrics report"""
+        counters = {key: value for key, value in stats.items() if key != 'needs_content'}
+        counters['needs_content'] = len(stats['needs_content'])
+        counters.update(self.counters)
+        return {
+            'version': 1,
+            'script_version': SYNC_SCRIPT_VERSION,
+            'started_at': self.started_at,
+            'total_seconds': round(time.perf_counter() - self._start, 6),
+            'options': options,
+            'phases': {
+                name: {'seconds': round(phase['seconds'], 6), 'calls': phase['calls']}
+                for name, phase in sorted(self.phases.items())
+            },
+            'counters': dict(sorted(counters.items())),
+            'files': [
+                dict(record, seconds=round(record['seconds'], 6))
+                for record in sorted(self.files, key=lambda r: r['target'])
+            ],
+        }
+
 
 class ReadmeSynchronizer:
     """Synchronizer that copies README files with proper attribution and image handling"""
     
-    def __init__(self, config_path: Path):
+    def __init__(self, config_path: Path, use_cache: bool = True, base_path: Optional[Path] = None,
+                 version: Optional[str] = None):
         self.config_path: Path = config_path
-        self.config: Dict = self._load_config()
-        self.base_path: Path = Path(os.getcwd())
+        self.base_path: Path = base_path or Path(os.getcwd())
+        # Documentation version synced into docs/<version>/ from its own refs (see sync_versions), if any
+        self.version: Optional[str] = version
+        
+        # Incremental sync cache (content-addressed manifest of previous runs), one per version
+        self.use_cache: bool = use_cache
+        self.cache_dir: Path = self.base_path / '.cache' / 'sync_readmes'
+        # Source files read from git, written once per blob id for copying; shared by all versions
+        self.blob_dir: Path = self.cache_dir / 'blobs'
+        if version is not None:
+            self.cache_dir = self.cache_dir / 'versions' / version
+        # Validated once per modification of the config file and shared with the other scripts
+        self.sync_config: SyncConfig = load_sync_config(self.config_path, self.base_path / '.cache' / 'config')
+        if version is not None:
+            self.sync_config = self.sync_config.for_version(version)
+        self.config: Dict = self.sync_config.data
+        self.manifest_path: Path = self.cache_dir / 'manifest.json'
+        docs_root = self.base_path / 'docs' / version if version is not None else self.base_path / 'docs'
+        self.report_path: Path = docs_root / 'documentation-needs-report.md'
+        self.image_index_path: Path = self.cache_dir / 'image_index.json'
+        self.config_hash: str = self._cache_config_hash(None)
+        # The manifest doubles as the dependency graph (target -> source README and source image ->
+        # docs asset) of the last run. The graph is kept even when the cache is invalidated or
+        # disabled, so targets and assets that are no longer produced can still be pruned.
+        manifest = self._read_manifest()
+        self._graph_entries: Dict[str, Dict] = manifest.get('entries', {})
+        self._manifest_entries: Dict[str, Dict] = self._load_manifest(manifest)
+        self._new_manifest_entries: Dict[str, Dict] = {}
+        
+        # Every write to docs/ is staged and committed in one batch of atomic renames at the end
+        # of a run, so an interrupted sync never leaves truncated pages behind
+        self.output: OutputTransaction = OutputTransaction(self.cache_dir / 'staging')
+        
+        # Locks for state shared between sync workers
+        self._stats_lock = threading.Lock()
+        self._copy_locks: Dict[Path, threading.Lock] = {}
+        self._copy_locks_lock = threading.Lock()
         
         # Configuration-driven thresholds
-        thresholds = self.config.get('content_thresholds', {})
-        self.min_content_length: int = thresholds.get('minimum_length', 500)
-        self.critical_threshold: int = thresholds.get('critical_threshold', 100)
+        self.min_content_length: int = self.sync_config.min_content_length
+        self.critical_threshold: int = self.sync_config.critical_threshold
         
         # Repository URLs from configuration
-        self.repo_urls: Dict[str, str] = self.config.get('repository_urls', {})
+        self.repo_urls: Dict[str, str] = self.sync_config.repo_urls
         
-        # Pre-compiled regex patterns for image path fixing
-        self.image_patterns: List[Pattern[str]] = [
-            re.compile(r'!\[([^\]]*)\]\(([^)]+)\)'),  # Markdown image syntax: ![alt](path)
-            re.compile(r'<img\s+([^>]*\s)?src="([^"]+)"'),  # HTML img tags: <img src="path" ...>
-            re.compile(r"<img\s+([^>]*\s)?src='([^']+)'"),  # HTML img tags with single quotes
-        ]
+        # Pre-compiled regexes for image path and link rewriting
+        self.image_pattern: Pattern[str] = IMAGE_PATTERN
+        self.reference_pattern: Pattern[str] = REFERENCE_PATTERN
+        
+        # Directories of pruned outputs, removed after the commit if that left them empty
+        self._pruned_dirs: Set[Path] = set()
+        
+        # Synced README -> target page map for rewriting links between synced documents
+        self.target_pages: Dict[Path, Path] = {}
+        for source, target in self.sync_config.entries:
+            self.target_pages[(self.base_path / source).resolve()] = self.base_path / target
         
         # Image file extensions
         self.image_extensions: Tuple[str, ...] = ('.png', '.jpg', '.jpeg', '.gif', '.svg', '.webp')
         
+        # Image asset store: 'basename' copies images flat by file name, 'content-addressed'
+        # stores each unique image once under a stable name derived from its content hash
+        asset_config = self.sync_config.assets
+        self.asset_store: str = self.sync_config.asset_store
+        self.asset_link: str = self.sync_config.asset_link
+        self.assets_dir: Path = self.base_path / 'docs' / 'assets' / 'images'
+        self.asset_manifest_path: Path = self.assets_dir / '.asset-manifest.json'
+        self._image_hashes: Dict[Path, Tuple[int, int, str]] = {}
+        self._stored_assets: Dict[str, Dict] = {}
+        self._previous_asset_records: Optional[Dict[str, Dict]] = None
+        self._previous_assets_lock = threading.Lock()
+        
+        # Optional image optimization stage (lossless PNG recompression, WebP and downscaled variants)
+        self.image_optimizer: Optional[ImageOptimizer] = None
+        if asset_config.get('optimize', {}).get('enabled', False):
+            self.enable_image_optimization()
+        
+        # Optional sparse working trees: source repositories only contain the configured READMEs
+        # and the images they reference, and are extended as new references are found
+        self.sparse_checkouts: Dict[str, SparseCheckout] = {}
+        
+        # Repositories read from git objects at a ref instead of from their working trees (the
+        # config's per-repository 'ref', overridable with --ref). Each gets one batch reader, opened
+        # on first use and re-resolved at the start of every sync.
+        self.source_refs: Dict[str, str] = dict(self.sync_config.repo_refs)
+        self._git_sources: Dict[str, GitSource] = {}
+        self._git_sources_lock = threading.Lock()
+        
         # Statistics tracking
+        self._reset_stats()
+    
+    def _reset_stats(self) -> None:
+        """Reset the statistics collected during a sync run"""
         self.stats: Dict = {
             'processed': 0,
             'warnings': 0,
             'errors': 0,
+            'cache_hits': 0,
+            'cache_misses': 0,
+            'written': 0,
+            'unchanged': 0,
+            'ambiguous_images': 0,
+            'images_optimized': 0,
+            'image_bytes_original': 0,
+            'image_bytes_optimized': 0,
+            'pruned_targets': 0,
+            'pruned_assets': 0,
+            'materialized': 0,
             'needs_content': []
         }
+        self.metrics: SyncMetrics = SyncMetrics()
+    
+    def _count(self, key: str, amount: int = 1) -> None:
+        """Increment a statistics counter (safe to call from sync workers)"""
+        with self._stats_lock:
+            self.stats[key] += amount
+    
+    def _copy_lock(self, dest_path: Path) -> threading.Lock:
+        """Get the lock serializing copies to a single destination image"""
+        with self._copy_locks_lock:
+            return self._copy_locks.setdefault(dest_path, threading.Lock())
+    
+    def enable_image_optimization(self) -> bool:
+        """Turn on the image optimization stage, returning False if Pillow is not installed"""
+        if not pillow_available():
+            logger.warning("Image optimization requested but Pillow is not installed (pip install pillow); "
+                           "copying images unchanged")
+            return False
+        
+        optimize_config = self.sync_config.assets.get('optimize', {})
+        self._set_image_optimizer(ImageOptimizer(
+            self.cache_dir / 'images',
+            webp=optimize_config.get('webp', False),
+            widths=optimize_config.get('widths', []),
+        ))
+        return True
+    
+    def _cache_config_hash(self, optimizer: Optional[ImageOptimizer]) -> str:
+        """Key of the sync cache: the configuration plus the effective image optimization settings
+        
+        Cached pages do not store their images again, so changing how images are written must miss.
+        """
+        optimize = optimizer.options_key if optimizer is not None else 'off'
+        return hashlib.sha256(f"{self.sync_config.content_hash}:optimize={optimize}".encode('utf-8')).hexdigest()
+    
+    def _set_image_optimizer(self, optimizer: Optional[ImageOptimizer]) -> None:
+        """Use an image optimizer (or none), discarding cached entries recorded with other settings"""
+        self.image_optimizer = optimizer
+        config_hash = self._cache_config_hash(optimizer)
+        if config_hash != self.config_hash:
+            self.config_hash = config_hash
+            self._manifest_entries = self._load_manifest(self._read_manifest())
+    
+    def enable_sparse_checkout(self) -> None:
+        """Manage the working trees of the source repositories that are git clones as sparse checkouts"""
+        for repo_name in self.repo_urls:
+            repo_path = self.base_path / repo_name
+            if repo_name in self.source_refs:
+                continue  # Read from git objects, the working tree is not used
+            if is_git_repository(repo_path):
+                self.sparse_checkouts[repo_name] = SparseCheckout(repo_path)
+            elif repo_path.is_dir():
+                logger.warning(f"{repo_name} is not a git repository; using its full working tree")
+    
+    def _materialize_sources(self) -> None:
+        """Limit each sparse source repository to its configured READMEs and the images they referenced last time"""
+        wanted: Dict[str, Set[str]] = {repo_name: set() for repo_name in self.sparse_checkouts}
+        paths = [source for source, _ in self.sync_config.entries]
+        for entry in self._graph_entries.values():
+            paths.extend(image_source for image_source, _, _, _ in entry.get('images', []))
+        for path in paths:
+            repo_name, _, rel_path = Path(path).as_posix().partition('/')
+            if repo_name in wanted:
+                wanted[repo_name].add(rel_path)
+        
+        for repo_name, sparse in self.sparse_checkouts.items():
+            selected = sparse.apply(wanted[repo_name])
+            logger.info(f"Sparse checkout of {repo_name}: {len(selected)} of {len(sparse.tracked_files())} files")
     
-    def _load_config(self) -> Dict:
-        """Load configuration from YAML file"""
-        with open(self.config_path, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
+    def _materialize(self, paths: Iterable[Path]) -> None:
+        """Add source files to the sparse checkouts of their repositories if they are not there yet"""
+        by_repo: Dict[str, List[str]] = {}
+        for path in paths:
+            try:
+                repo_name, _, rel_path = path.relative_to(self.base_path).as_posix().partition('/')
+            except ValueError:
+                continue  # Outside the source repositories
+            if repo_name in self.sparse_checkouts:
+                by_repo.setdefault(repo_name, []).append(rel_path)
+        
+        for repo_name, rel_paths in by_repo.items():
+            added = self.sparse_checkouts[repo_name].add(rel_paths)
+            if added:
+                logger.info(f"  Added {len(added)} file(s) to the sparse checkout of {repo_name}")
+                self._count('materialized', len(added))
+    
+    def _referenced_images(self, content: str, source_path: Path) -> List[Path]:
+        """List the local images referenced by a source README, resolved against its directory"""
+        images = []
+        for chunk, in_code in _markdown_chunks(content):
+            if in_code:
+                continue
+            image_paths = [
+                match.group(self._reference_group(match)) for match in self.reference_pattern.finditer(chunk)
+                if self._reference_group(match) not in ('link_path', 'dq_href', 'sq_href')
+            ]
+            if ']:' in chunk:
+                # Reference definitions are images when they point at one, as in ![alt][logo]
+                image_paths.extend(self._definition_path(match) for match in LINK_DEFINITION_PATTERN.finditer(chunk))
+            for image_path in image_paths:
+                if image_path.startswith(('http://', 'https://', '/', '#')):
+                    continue
+                abs_path = (source_path.parent / image_path).resolve()
+                if abs_path.suffix.lower() in self.image_extensions:
+                    images.append(abs_path)
+        return images
+    
+    def _git_source(self, repo_name: str) -> GitSource:
+        """Return the git object reader of a repository read at a ref, opening it on first use"""
+        with self._git_sources_lock:
+            source = self._git_sources.get(repo_name)
+            if source is None:
+                source = GitSource(self.base_path / repo_name, self.source_refs[repo_name])
+                self._git_sources[repo_name] = source
+            return source
+    
+    def close_git_sources(self) -> None:
+        """Stop the git batch readers; the next read re-resolves the refs"""
+        with self._git_sources_lock:
+            for source in self._git_sources.values():
+                source.close()
+            self._git_sources.clear()
+    
+    def _git_blob_path(self, path: Path) -> Optional[Tuple[GitSource, str]]:
+        """Return the reader and repository-relative path of a source file read from git, or None"""
+        if not self.source_refs:
+            return None
+        try:
+            repo_name, _, rel_path = Path(path).relative_to(self.base_path).as_posix().partition('/')
+        except ValueError:
+            return None
+        if repo_name not in self.source_refs:
+            return None
+        return self._git_source(repo_name), rel_path
+    
+    def _source_exists(self, path: Path) -> bool:
+        """Check whether a source file exists, in git at the configured ref or in the working tree"""
+        blob_path = self._git_blob_path(path)
+        if blob_path is not None:
+            source, rel_path = blob_path
+            return rel_path in source.files
+        return path.exists()
+    
+    def _source_bytes(self, path: Path) -> bytes:
+        """Read a source file, from git at the configured ref or from the working tree"""
+        blob_path = self._git_blob_path(path)
+        if blob_path is not None:
+            source, rel_path = blob_path
+            return source.read(rel_path)
+        return path.read_bytes()
+    
+    def _source_signature(self, path: Path) -> Tuple[int, Any]:
+        """Return (size, version) of a source file without reading it, raising OSError if it is missing
+        
+        The version is the mtime in nanoseconds for working-tree files and the blob id for files read
+        from git, so cached entries recorded from the working tree never match files read from git.
+        """
+        blob_path = self._git_blob_path(path)
+        if blob_path is not None:
+            source, rel_path = blob_path
+            blob_id, size = source.blob(rel_path)
+            return size, blob_id
+        st = path.stat()
+        return st.st_size, st.st_mtime_ns
+    
+    def _source_file(self, path: Path) -> Path:
+        """Return a file on disk with the content of a source file, for copying and image optimization
+        
+        Files read from git are written once to .cache/sync_readmes/blobs/, named by blob id.
+        """
+        blob_path = self._git_blob_path(path)
+        if blob_path is None:
+            return path
+        source, rel_path = blob_path
+        blob_id, _ = source.blob(rel_path)
+        blob_file = self.blob_dir / f"{blob_id}{path.suffix}"
+        if not blob_file.exists():
+            atomic_write_bytes(blob_file, source.read(rel_path))
+        return blob_file
+    
+    def _source_ref(self, source: str) -> Optional[str]:
+        """Return the git ref a configured source README is read at, or None for the working tree"""
+        return self.source_refs.get(Path(source).parts[0])
+    
+    def share_output(self, primary: 'ReadmeSynchronizer') -> None:
+        """Stage into the output transaction and image store of another synchronizer
+        
+        Used for versions synced together: images are hashed, optimized and stored once for all of
+        them, and their outputs are committed at once.
+        """
+        self.output = primary.output
+        self._set_image_optimizer(primary.image_optimizer)
+        self._stored_assets = primary._stored_assets
+        self._pruned_dirs = primary._pruned_dirs
+        self._image_hashes = primary._image_hashes
+        self._copy_locks = primary._copy_locks
+        self._copy_locks_lock = primary._copy_locks_lock
+    
+    def _hash_image(self, image_path: Path) -> str:
+        """Return the content hash of an image, cached for as long as its size and version are unchanged"""
+        size, version = self._source_signature(image_path)
+        cached = self._image_hashes.get(image_path)
+        if cached and cached[0] == size and cached[1] == version:
+            return cached[2]
+        
+        data = self._source_bytes(image_path)
+        self.metrics.count('bytes_read', len(data))
+        digest = hashlib.sha256(data).hexdigest()
+        self._image_hashes[image_path] = (size, version, digest)
+        return digest
+    
+    def _asset_dest(self, image_path: Path) -> Path:
+        """Get the path an existing source image is stored under in docs/assets/images"""
+        if self.asset_store == 'content-addressed':
+            # Named by content alone, so identical images under different names are stored once
+            digest = self._hash_image(image_path)
+            suffix = image_path.suffix.lower()
+            return self.assets_dir / f"{digest[:16]}{ASSET_SUFFIXES.get(suffix, suffix)}"
+        return self.assets_dir / image_path.name
+    
+    def _store_image(self, source: Path, dest: Path) -> bool:
+        """Copy (or hardlink) an image into the docs assets, returning True if the file was written"""
+        with self.metrics.phase('copy_images'), self._copy_lock(dest):
+            if self.asset_store != 'content-addressed':
+                # Only copy if source is newer or dest doesn't exist
+                source_file = self._source_file(source)
+                if not self.output.exists(dest) or source_file.stat().st_mtime > self.output.resolve(dest).stat().st_mtime:
+                    self._write_image(source, dest)
+                    return True
+                return False
+            
+            record = self._stored_assets.get(dest.name)
+            if record is None:
+                previous = self._previous_assets().get(dest.name, {})
+                record = self._stored_assets.setdefault(dest.name, {
+                    'sha256': self._hash_image(source),
+                    'size': self._source_signature(source)[0],
+                    'sources': set(),
+                    'variants': set(previous.get('variants', [])),
+                    'options': previous.get('options') if previous.get('sha256') == self._hash_image(source) else None,
+                })
+            record['sources'].add(str(source.relative_to(self.base_path)))
+            
+            # The name only depends on the source content, but the stored bytes also depend on how
+            # they were written, so an existing file is only kept if it was written the same way
+            options = self._asset_options()
+            if record['options'] == options and all(
+                self.output.exists(dest.parent / name) for name in [dest.name, *record['variants']]
+            ):
+                return False
+            
+            variants = set(self._write_image(source, dest))
+            for stale in sorted(record['variants'] - variants):
+                if self.output.exists(dest.parent / stale):
+                    self.output.delete(dest.parent / stale)
+            record['variants'] = variants
+            record['options'] = options
+            return True
+    
+    def _asset_options(self) -> str:
+        """Describe how the content-addressed store writes images, recorded with every stored image"""
+        if self.image_optimizer is not None:
+            return f"optimize-{self.image_optimizer.options_key}"
+        return self.asset_link
+    
+    def _previous_assets(self) -> Dict[str, Dict]:
+        """Records of the images stored by previous runs, loaded once"""
+        with self._previous_assets_lock:
+            if self._previous_asset_records is None:
+                self._previous_asset_records = self._load_asset_manifest()
+            return self._previous_asset_records
+    
+    def _write_image(self, source: Path, dest: Path) -> List[str]:
+        """Write an image (optimized if enabled) to dest and return the names of generated variants"""
+        source_file = self._source_file(source)
+        outputs = None
+        if self.image_optimizer is not None:
+            try:
+                outputs = self.image_optimizer.process(source_file, self._hash_image(source))
+            except Exception as e:
+                logger.warning(f"Image optimization failed for {source}: {e}")
+        
+        if outputs is None:
+            if self.asset_link == 'hardlink' and self.asset_store == 'content-addressed':
+                try:
+                    self.output.link_file(source_file, dest)
+                    return []
+                except OSError:
+                    pass  # e.g. source and docs on different file systems
+            self.output.copy_file(source_file, dest)
+            self.metrics.count('bytes_written', source_file.stat().st_size)
+            return []
+        
+        self.output.copy_file(outputs[''], dest, preserve_metadata=False)
+        import shutil
+        shutil.copystat(source_file, self.output.resolve(dest))
+        
+        variants = []
+        for variant, cached_path in sorted(outputs.items()):
+            if variant:
+                variant_name = self.image_optimizer.variant_name(dest.name, variant)
+                self.output.copy_file(cached_path, dest.parent / variant_name, preserve_metadata=False)
+                self.metrics.count('bytes_written', cached_path.stat().st_size)
+                variants.append(variant_name)
+        
+        original_size = source_file.stat().st_size
+        optimized_size = self.output.resolve(dest).stat().st_size
+        self.metrics.count('bytes_written', optimized_size)
+        with self._stats_lock:
+            self.stats['images_optimized'] += 1
+            self.stats['image_bytes_original'] += original_size
+            self.stats['image_bytes_optimized'] += optimized_size
+        saved = original_size - optimized_size
+        logger.info(f"Optimized {source.name}: {original_size / 1024:.1f} KB -> {optimized_size / 1024:.1f} KB "
+                    f"({saved / max(original_size, 1):.0%} smaller)"
+                    + (f", variants: {', '.join(variants)}" if variants else ""))
+        return variants
+    
+    def _save_asset_manifest(self) -> None:
+        """Record every image written by the content-addressed store so orphans can be collected"""
+        if self.asset_store != 'content-addressed':
+            return
+        
+        assets = self._load_asset_manifest()
+        for name, record in self._stored_assets.items():
+            previous = assets.get(name, {})
+            assets[name] = {
+                'sha256': record['sha256'],
+                'size': record['size'],
+                'sources': sorted(set(previous.get('sources', [])) | record['sources']),
+                'variants': sorted(record['variants']),
+                'options': record['options'],
+            }
+        
+        self._write_if_changed(self.asset_manifest_path, json.dumps({'assets': assets}, indent=2, sort_keys=True))
+    
+    def _load_asset_manifest(self) -> Dict[str, Dict]:
+        """Load the records of images previously written by the content-addressed store"""
+        if not self.output.exists(self.asset_manifest_path):
+            return {}
+        try:
+            return json.loads(self.output.read_text(self.asset_manifest_path)).get('assets', {})
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable asset manifest {self.asset_manifest_path}: {e}")
+            return {}
+    
+    def _gc_assets(self, dry_run: bool = False) -> None:
+        """Delete stored images that are no longer referenced by any markdown file in docs/"""
+        assets = self._load_asset_manifest()
+        if not assets:
+            logger.info("\nAsset garbage collection: no managed assets recorded")
+            return
+        
+        referenced = self._referenced_assets()
+        orphans = sorted(name for name in assets if name not in referenced)
+        freed = self._delete_assets(orphans, assets, dry_run)
+        
+        logger.info(f"\nAsset garbage collection: {len(orphans)} orphaned of {len(assets)} managed assets"
+                    f" ({freed / 1024:.1f} KB freed)")
+    
+    def _referenced_assets(self) -> Set[str]:
+        """Collect the names of all docs/assets/images files referenced by markdown files in docs/"""
+        referenced: Set[str] = set()
+        for md_file in self._docs_markdown_files():
+            referenced.update(ASSET_REF_PATTERN.findall(self.output.read_text(md_file)))
+        return referenced
+    
+    def _delete_assets(self, names: List[str], assets: Dict[str, Dict], dry_run: bool) -> int:
+        """Delete images (and their variants) from docs/assets/images, returning the bytes freed"""
+        freed = 0
+        for name in names:
+            # Generated variants (WebP, downscaled) go together with their image
+            for file_name in [name] + assets.get(name, {}).get('variants', []):
+                path = self.assets_dir / file_name
+                if dry_run:
+                    logger.info(f"  [DRY RUN] Would delete orphaned asset: {path}")
+                elif self.output.exists(path):
+                    freed += self.output.resolve(path).stat().st_size
+                    self.output.delete(path)
+                    logger.info(f"  Deleted orphaned asset: {path}")
+        
+        # Forget the deleted images in the asset manifest of the content-addressed store
+        deleted = [name for name in names if name in assets]
+        if not dry_run and deleted:
+            kept = {name: record for name, record in assets.items() if name not in deleted}
+            self.output.write_text(self.asset_manifest_path, json.dumps({'assets': kept}, indent=2, sort_keys=True))
+        
+        return freed
+    
+    def _prune_stale_outputs(self, dry_run: bool = False) -> None:
+        """Delete targets and assets the previous run produced that the current configuration no longer does
+        
+        A target is stale when its entry was removed from the configuration or its source README was
+        deleted. Targets edited since they were synced are kept (with a warning). Assets are stale when
+        only stale or changed targets referenced them and no markdown file in docs/ still does.
+        """
+        configured = self.sync_config.target_map
+        
+        stale_targets = sorted(
+            target for target, entry in self._graph_entries.items()
+            if target not in configured or not self._source_exists(self.base_path / configured[target])
+        )
+        for target in stale_targets:
+            entry = self._graph_entries[target]
+            target_path = self.base_path / target
+            self._new_manifest_entries.pop(target, None)
+            if not self.output.exists(target_path):
+                continue
+            
+            st = self.output.resolve(target_path).stat()
+            if st.st_size != entry.get('output_size') or st.st_mtime_ns != entry.get('output_mtime_ns'):
+                logger.warning(f"Not pruning {target}: modified since it was synced from {entry.get('source')}")
+                self._count('warnings')
+            elif dry_run:
+                logger.info(f"[DRY RUN] Would prune stale target: {target} (source {entry.get('source')} removed)")
+            else:
+                self.output.delete(target_path)
+                self._pruned_dirs.add(target_path.parent)
+                self._count('pruned_targets')
+                logger.info(f"Pruned stale target: {target} (source {entry.get('source')} removed)")
+        
+        # Assets that the previous graph referenced but the new one does not
+        def graph_assets(entries: Dict[str, Dict]) -> Set[str]:
+            return {Path(image[1]).name for entry in entries.values() for image in entry.get('images', []) if image[1]}
+        
+        # A dry run records no new entries, so it cannot tell which assets are still produced
+        if dry_run:
+            return
+        candidates = graph_assets(self._graph_entries) - graph_assets(self._new_manifest_entries)
+        if not candidates:
+            return
+        
+        stale_assets = sorted(candidates - self._referenced_assets())
+        freed = self._delete_assets(stale_assets, self._load_asset_manifest(), dry_run)
+        self._count('pruned_assets', len(stale_assets))
+        if stale_assets:
+            logger.info(f"Pruned {len(stale_assets)} stale asset(s) ({freed / 1024:.1f} KB freed)")
+    
+    def _read_manifest(self) -> Dict:
+        """Read the manifest written by the previous run"""
+        if not self.manifest_path.exists():
+            return {}
+        
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable sync cache {self.manifest_path}: {e}")
+            return {}
+    
+    def _load_manifest(self, manifest: Dict) -> Dict[str, Dict]:
+        """Get the cached entries from the previous run, discarding them if the config or script changed"""
+        if not self.use_cache or not manifest:
+            return {}
+        
+        if manifest.get('version') != SYNC_SCRIPT_VERSION or manifest.get('config_hash') != self.config_hash:
+            logger.info("Sync cache invalidated (configuration or script version changed)")
+            return {}
+        
+        return manifest.get('entries', {})
+    
+    def _save_manifest(self) -> None:
+        """Persist the cache entries (and dependency graph) recorded during this run"""
+        entries = self._new_manifest_entries
+        
+        # Later runs of a long-lived synchronizer compare against this run
+        self._manifest_entries = entries
+        self._graph_entries = entries
+        self._new_manifest_entries = {}
+        
+        # Written even with the cache disabled: the next run needs the graph to prune stale outputs
+        manifest = {
+            'version': SYNC_SCRIPT_VERSION,
+            'config_hash': self.config_hash,
+            'entries': entries,
+        }
+        atomic_write_text(self.manifest_path, json.dumps(manifest, indent=2, sort_keys=True))
+    
+    def _hash_source(self, source_path: Path, entry: Optional[Dict]) -> Tuple[str, Optional[bytes]]:
+        """Return the content hash of a source file, reusing the cached hash if its size and version are unchanged"""
+        size, version = self._source_signature(source_path)
+        if entry and entry.get('source_size') == size and entry.get('source_mtime_ns') == version:
+            return entry['source_hash'], None
+        
+        data = self._source_bytes(source_path)
+        self.metrics.count('bytes_read', len(data))
+        return hashlib.sha256(data).hexdigest(), data
+    
+    def _is_cache_hit(self, entry: Optional[Dict], source: str, source_hash: str, target_path: Path) -> bool:
+        """Check whether a cached entry is still valid for the given source content"""
+        if not entry or entry.get('source') != source or entry.get('source_hash') != source_hash:
+            return False
+        
+        # Links to GitHub point at the ref the source was read at
+        if entry.get('ref') != self._source_ref(source):
+            return False
+        
+        # The target must still be exactly what we wrote last time
+        try:
+            st = target_path.stat()
+        except OSError:
+            return False
+        if st.st_size != entry.get('output_size') or st.st_mtime_ns != entry.get('output_mtime_ns'):
+            return False
+        
+        # Referenced images must be unchanged and still present in the docs assets, and images
+        # that were missing (recorded without a destination) must still be missing
+        for image_source, image_dest, size, mtime_ns in entry.get('images', []):
+            if image_dest is None:
+                if self._source_exists(self.base_path / image_source):
+                    return False
+                continue
+            try:
+                if self._source_signature(self.base_path / image_source) != (size, mtime_ns):
+                    return False
+            except OSError:
+                return False
+            if not self.output.exists(self.base_path / image_dest):
+                return False
+        
+        return True
+    
+    def _write_if_changed(self, target_path: Path, content: str) -> bool:
+        """Stage content for target only if the bytes differ from what is already there"""
+        data = content.encode('utf-8')
+        try:
+            if self.output.read_bytes(target_path) == data:
+                return False
+        except OSError:
+            pass
+        
+        self.output.write_bytes(target_path, data)
+        self.metrics.count('bytes_written', len(data))
+        return True
+    
+    def _commit_output(self) -> None:
+        """Move all staged outputs into place; the sync cache is saved only once they are"""
+        with self.metrics.phase('commit'):
+            changes = self.output.commit()
+            if changes:
+                logger.info(f"Committed {changes} output file change(s)")
+            self._remove_pruned_dirs()
+            self._save_manifest()
+    
+    def _remove_pruned_dirs(self) -> None:
+        """Remove the directories that pruned targets left empty, and their empty parents up to docs/"""
+        docs_dir = (self.base_path / 'docs').resolve()
+        # Deepest first, so a directory holding only emptied subdirectories is empty by its turn
+        for directory in sorted(self._pruned_dirs, key=lambda path: len(path.parts), reverse=True):
+            directory = directory.resolve()
+            while docs_dir in directory.parents:
+                try:
+                    directory.rmdir()
+                except OSError:
+                    break  # Not empty, or removed already
+                logger.info(f"Removed empty directory: {directory.relative_to(docs_dir)}")
+                directory = directory.parent
+        self._pruned_dirs.clear()
+    
+    def _docs_markdown_files(self) -> List[Path]:
+        """List the markdown files in docs/, including pages staged but not yet committed"""
+        docs_dir = self.base_path / 'docs'
+        files = {path for path in docs_dir.rglob('*.md') if self.output.exists(path)}
+        for path in self.output.staged_paths():
+            if path.suffix == '.md' and docs_dir.resolve() in path.resolve().parents:
+                files.add(path)
+        return sorted(files)
     
     def _validate_source_repositories(self) -> None:
         """Validate that all configured source repositories exist"""
@@ -97,91 +1019,297 @@ class ReadmeSynchronizer:
             raise FileNotFoundError(f"Missing repositories: {', '.join(missing_repos)}")
         
         logger.info(f"✓ All {len(self.repo_urls)} source repositories found")
+        
+        for repo_name, ref in self.source_refs.items():
+            source = self._git_source(repo_name)
+            logger.info(f"Reading {repo_name} from git at {ref} ({source.commit[:12]}, {len(source.files)} files)")
     
-    def sync_all(self, dry_run: bool = False, fix_all_images: bool = False) -> None:
+    def sync_all(self, dry_run: bool = False, fix_all_images: bool = False, jobs: int = 1,
+                 gc_assets: bool = False) -> None:
         """Synchronize all README files according to configuration"""
         logger.info("Starting README synchronization...")
+        self._reset_stats()
         
-        # Validate source repositories exist
-        self._validate_source_repositories()
-        
-        for repo_config in self.config['repositories']:
-            self._sync_repository(repo_config, dry_run)
+        try:
+            self._sync_sources(dry_run, jobs)
+            
+            # Fix all images if requested
+            if fix_all_images:
+                logger.info("\nFixing images in all markdown files...")
+                with self.metrics.phase('fix_all_images'):
+                    self._fix_all_images_in_docs(dry_run, jobs)
+            
+            # Record the stored images so orphans can be collected later
+            if not dry_run:
+                self._save_asset_manifest()
+            
+            # Delete targets and assets that are no longer produced
+            with self.metrics.phase('prune'):
+                self._prune_stale_outputs(dry_run)
+            
+            # Remove stored images that no page references any more
+            if gc_assets:
+                with self.metrics.phase('gc_assets'):
+                    self._gc_assets(dry_run)
+            
+            # Generate documentation needs report
+            if self.stats['needs_content']:
+                with self.metrics.phase('report'):
+                    self._generate_documentation_needs_report(dry_run)
+            elif dry_run:
+                logger.info(f"\n[DRY RUN] No documentation needs report needed - all files have sufficient content")
+            
+            # Publish every output at once, then remember what was synced so unchanged
+            # sources are skipped next time
+            if not dry_run:
+                self._commit_output()
+        except BaseException:
+            self.output.rollback()
+            raise
+        finally:
+            self.close_git_sources()
         
-        # Fix all images if requested
-        if fix_all_images:
-            logger.info("\nFixing images in all markdown files...")
-            self._fix_all_images_in_docs(dry_run)
+        logger.info(f"\nSynchronization complete!")
+        self._log_summary()
+    
+    def _sync_sources(self, dry_run: bool, jobs: int) -> None:
+        """Validate the source repositories and stage the synced page of every configured README"""
+        # Validate source repositories exist
+        with self.metrics.phase('validate'):
+            self._validate_source_repositories()
         
-        # Generate documentation needs report
-        if self.stats['needs_content']:
-            self._generate_documentation_needs_report(dry_run)
-        elif dry_run:
-            logger.info(f"\n[DRY RUN] No documentation needs report needed - all files have sufficient content")
+        # A dry run never changes the sparse sets; it sees the working trees as they are
+        if self.sparse_checkouts and not dry_run:
+            with self.metrics.phase('materialize_sources'):
+                self._materialize_sources()
         
-        # Print summary
-        logger.info(f"\nSynchronization complete!")
+        with self.metrics.phase('sync_readmes'):
+            if jobs > 1:
+                self._sync_repositories_parallel(dry_run, jobs)
+            else:
+                for repo_name in self.sync_config.repo_names:
+                    self._sync_repository(repo_name, dry_run)
+    
+    def _log_summary(self) -> None:
+        """Log the statistics of the last run"""
         logger.info(f"Files processed: {self.stats['processed']}")
+        logger.info(f"Files written: {self.stats['written']} (unchanged: {self.stats['unchanged']})")
+        if self.stats['pruned_targets'] or self.stats['pruned_assets']:
+            logger.info(f"Pruned stale targets: {self.stats['pruned_targets']}, assets: {self.stats['pruned_assets']}")
+        if self.use_cache:
+            logger.info(f"Cache hits: {self.stats['cache_hits']}, misses: {self.stats['cache_misses']}")
+        if self.sparse_checkouts:
+            logger.info(f"Files added to sparse checkouts: {self.stats['materialized']}")
+        if self.stats['images_optimized']:
+            original = self.stats['image_bytes_original']
+            optimized = self.stats['image_bytes_optimized']
+            logger.info(f"Images optimized: {self.stats['images_optimized']} "
+                        f"({original / 1024:.1f} KB -> {optimized / 1024:.1f} KB, "
+                        f"{(original - optimized) / 1024:.1f} KB page weight saved)")
         logger.info(f"Warnings: {self.stats['warnings']}")
         logger.info(f"Errors: {self.stats['errors']}")
         logger.info(f"Files needing content: {len(self.stats['needs_content'])}")
     
-    def _sync_repository(self, repo_config: Dict, dry_run: bool) -> None:
+    def sync_changed(self) -> int:
+        """Re-sync only README files whose source or referenced images changed since the last run
+        
+        Intended for long-lived synchronizers (e.g. the MkDocs hooks during `mkdocs serve`): up-to-date
+        entries are detected from the in-memory manifest with a few stat calls and skipped silently.
+        Returns the number of README files that were processed.
+        """
+        self._reset_stats()
+        
+        stale = []
+        try:
+            with self.metrics.phase('check_up_to_date'):
+                for source, target in self.sync_config.entries:
+                    if self._is_up_to_date(source, target):
+                        entry = self._manifest_entries[target]
+                        self._new_manifest_entries[target] = entry
+                        self._track_content_length(source, target, entry['length'])
+                    else:
+                        stale.append((source, target))
+            
+            with self.metrics.phase('sync_readmes'):
+                for source, target in stale:
+                    self._process_readme(source, target, dry_run=False)
+            self._save_asset_manifest()
+            self._prune_stale_outputs()
+            
+            # Only re-synced READMEs can change the report; it is not rewritten if it stays the same
+            if stale and self.stats['needs_content']:
+                with self.metrics.phase('report'):
+                    self._generate_documentation_needs_report()
+            self._commit_output()
+        except BaseException:
+            self.output.rollback()
+            raise
+        finally:
+            # Branch refs are re-resolved on the next rebuild
+            self.close_git_sources()
+        return len(stale)
+    
+    def write_metrics(self, metrics_path: Path, options: Dict) -> None:
+        """Write the timings, byte counters and statistics of the last run as JSON"""
+        report = self.metrics.to_dict(self.stats, options)
+        atomic_write_text(metrics_path, json.dumps(report, indent=2))
+        logger.info(f"Metrics written to {metrics_path}")
+    
+    def _is_up_to_date(self, source: str, target: str) -> bool:
+        """Check with stat calls only whether a README entry matches its cached sync result"""
+        entry = self._manifest_entries.get(target)
+        if not entry:
+            return False
+        
+        try:
+            if self._source_signature(self.base_path / source) != (entry.get('source_size'), entry.get('source_mtime_ns')):
+                return False
+        except OSError:
+            return False
+        
+        return self._is_cache_hit(entry, source, entry['source_hash'], self.base_path / target)
+    
+    def watch(self, jobs: int = 1, debounce: float = 0.2, poll_interval: float = 0.5) -> None:
+        """Sync once, then re-sync affected README files whenever a source or referenced image changes"""
+        self.sync_all(jobs=jobs)
+        
+        try:
+            watcher = _InotifyWatcher()
+            logger.info("\nWatching source READMEs and images for changes (inotify). Press Ctrl+C to stop.")
+        except ImportError:
+            watcher = _PollingWatcher(poll_interval)
+            logger.info("\nWatching source READMEs and images for changes (polling, install watchdog for inotify). "
+                        "Press Ctrl+C to stop.")
+        
+        try:
+            while True:
+                dependents = self._watch_dependents()
+                changed = watcher.wait(set(dependents), debounce)
+                
+                affected = []
+                for path in sorted(changed):
+                    for entry in dependents[path]:
+                        if entry not in affected:
+                            affected.append(entry)
+                if not affected:
+                    continue
+                
+                start = time.perf_counter()
+                self._reset_stats()
+                self._new_manifest_entries = dict(self._manifest_entries)
+                try:
+                    for source, target in affected:
+                        self._process_readme(source, target, dry_run=False)
+                    self._save_asset_manifest()
+                    self._commit_output()
+                except BaseException:
+                    self.output.rollback()
+                    raise
+                logger.info(f"Re-synced {len(affected)} file(s) in {(time.perf_counter() - start) * 1000:.0f} ms "
+                            f"({self.stats['errors']} errors)")
+        except KeyboardInterrupt:
+            logger.info("\nStopped watching")
+        finally:
+            watcher.close()
+    
+    def _watch_dependents(self) -> Dict[Path, List[Tuple[str, str]]]:
+        """Map each source README and referenced image (present or missing) to the entries that depend on it"""
+        dependents: Dict[Path, List[Tuple[str, str]]] = {}
+        for source, target in self.sync_config.entries:
+            dependents.setdefault(self.base_path / source, []).append((source, target))
+            entry = self._manifest_entries.get(target, {})
+            for image_source, _, _, _ in entry.get('images', []):
+                dependents.setdefault(self.base_path / image_source, []).append((source, target))
+        return dependents
+    
+    def _sync_repository(self, repo_name: str, dry_run: bool) -> None:
         """Synchronize README files from a single repository"""
-        repo_name = repo_config['name']
         logger.info(f"\nProcessing repository: {repo_name}")
         
-        # Process main README
-        if 'main_readme' in repo_config:
-            self._process_readme(
-                repo_config['main_readme']['source'],
-                repo_config['main_readme']['target'],
-                dry_run
-            )
-        
-        # Process sub-READMEs
-        for sub_readme in repo_config.get('sub_readmes', []):
-            self._process_readme(
-                sub_readme['source'],
-                sub_readme['target'],
-                dry_run
-            )
+        for source, target in self.sync_config.readmes[repo_name]:
+            self._process_readme(source, target, dry_run)
+    
+    def _sync_repositories_parallel(self, dry_run: bool, jobs: int) -> None:
+        """Synchronize README files from all repositories on a bounded thread pool"""
+        logger.info(f"Syncing with {jobs} parallel workers")
+        
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            # Submit every README up front so workers are never idle between repositories
+            submitted = []
+            for repo_name, readmes in self.sync_config.readmes.items():
+                futures = [
+                    executor.submit(_log_buffer.capture, self._process_readme, source, target, dry_run)
+                    for source, target in readmes
+                ]
+                submitted.append((repo_name, futures))
+            
+            # Replay each file's log lines as one group, in configuration order
+            for repo_name, futures in submitted:
+                logger.info(f"\nProcessing repository: {repo_name}")
+                for future in futures:
+                    _, records = future.result()
+                    for record in records:
+                        logger.handle(record)
     
     def _process_readme(self, source: str, target: str, dry_run: bool) -> None:
         """Process a single README file"""
+        with self.metrics.file(source, target) as file_metrics:
+            file_metrics['result'] = self._sync_readme(source, target, dry_run)
+    
+    def _sync_readme(self, source: str, target: str, dry_run: bool) -> str:
+        """Sync a single README file and return the outcome recorded in the metrics"""
         source_path = self.base_path / source
         target_path = self.base_path / target
         
-        if not source_path.exists():
+        if not self._source_exists(source_path):
             logger.error(f"Source file not found: {source_path}")
-            self.stats['errors'] += 1
-            return
+            self._count('errors')
+            return 'missing'
         
         logger.info(f"Processing: {source} -> {target}")
         
         try:
+            # Skip sources whose content, config and referenced images are unchanged
+            entry = self._manifest_entries.get(target)
+            with self.metrics.phase('read_source'):
+                source_hash, raw = self._hash_source(source_path, entry)
+            if self._is_cache_hit(entry, source, source_hash, target_path):
+                logger.info("  Unchanged since last sync (cache hit)")
+                self._track_content_length(source, target, entry['length'])
+                self._new_manifest_entries[target] = entry
+                self._count('cache_hits')
+                self._count('unchanged')
+                self._count('processed')
+                return 'cache_hit'
+            
+            self._count('cache_misses')
+            
             # Read source content
-            with open(source_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            if raw is None:
+                with self.metrics.phase('read_source'):
+                    raw = self._source_bytes(source_path)
+                self.metrics.count('bytes_read', len(raw))
+            content = raw.decode('utf-8')
+            
+            # Images are only in a sparse working tree once something references them
+            if self.sparse_checkouts and not dry_run:
+                with self.metrics.phase('materialize_sources'):
+                    self._materialize(self._referenced_images(content, source_path))
             
             # Fix image paths
-            content = self._fix_image_paths(content, source_path, target_path, dry_run)
+            image_deps: List[Tuple[Path, Optional[Path]]] = []
+            with self.metrics.phase('rewrite_references'):
+                content = self._fix_image_paths(content, source_path, target_path, dry_run, image_deps)
             
             # Check if content is minimal
             content_length = len(content.strip())
-            needs_documentation = content_length < self.min_content_length
-            
+            needs_documentation = self._track_content_length(source, target, content_length)
             
             # Add TODO warning if content is minimal
             todo_warning = ""
             if needs_documentation:
                 todo_warning = self._generate_todo_warning(source_path, content_length)
-                self.stats['needs_content'].append({
-                    'source': source,
-                    'target': target,
-                    'length': content_length
-                })
-                self.stats['warnings'] += 1
             
             # Combine content
             final_content = ""
@@ -194,22 +1322,76 @@ class ReadmeSynchronizer:
                 final_content += f"\n\n---\n\n*Note: This documentation page requires additional content from the engineering team. The current source README file contains only {content_length} characters.*"
             
             if not dry_run:
-                # Ensure target directory exists
-                target_path.parent.mkdir(parents=True, exist_ok=True)
+                # Write to target, leaving it untouched if the output is identical
+                with self.metrics.phase('write_output'):
+                    written = self._write_if_changed(target_path, final_content)
+                if written:
+                    self._count('written')
+                    result = 'written'
+                else:
+                    logger.info(f"  Output unchanged, not rewriting {target}")
+                    self._count('unchanged')
+                    result = 'unchanged'
                 
-                # Write to target
-                with open(target_path, 'w', encoding='utf-8') as f:
-                    f.write(final_content)
+                self._record_manifest_entry(source, target, source_path, target_path, source_hash,
+                                            content_length, image_deps)
             else:
                 logger.info(f"  [DRY RUN] Would write to {target_path}")
+                result = 'dry_run'
             
-            self.stats['processed'] += 1
-            
+            self._count('processed')
+            return result
+        
         except Exception as e:
             logger.error(f"Failed to process {source_path}: {e}")
-            self.stats['errors'] += 1
+            self._count('errors')
+            return 'error'
     
+    def _track_content_length(self, source: str, target: str, content_length: int) -> bool:
+        """Record a file with minimal content for the documentation needs report"""
+        needs_documentation = content_length < self.min_content_length
+        if needs_documentation:
+            with self._stats_lock:
+                self.stats['needs_content'].append({
+                    'source': source,
+                    'target': target,
+                    'length': content_length
+                })
+                self.stats['warnings'] += 1
+        return needs_documentation
     
+    def _record_manifest_entry(self, source: str, target: str, source_path: Path, target_path: Path,
+                               source_hash: str, content_length: int,
+                               image_deps: List[Tuple[Path, Optional[Path]]]) -> None:
+        """Record the inputs and output of a processed README in the sync cache"""
+        # The 'mtime_ns' fields hold the blob id for sources read from git (see _source_signature)
+        source_size, source_version = self._source_signature(source_path)
+        # Renaming the staged file into place keeps its size and mtime
+        target_stat = self.output.resolve(target_path).stat()
+        images = []
+        for image_source, image_dest in image_deps:
+            if image_dest is None:
+                images.append([str(image_source.relative_to(self.base_path)), None, None, None])
+                continue
+            image_size, image_version = self._source_signature(image_source)
+            images.append([
+                str(image_source.relative_to(self.base_path)),
+                str(image_dest.relative_to(self.base_path)),
+                image_size,
+                image_version,
+            ])
+        
+        self._new_manifest_entries[target] = {
+            'source': source,
+            'source_hash': source_hash,
+            'source_size': source_size,
+            'source_mtime_ns': source_version,
+            'ref': self._source_ref(source),
+            'output_size': target_stat.st_size,
+            'output_mtime_ns': target_stat.st_mtime_ns,
+            'length': content_length,
+            'images': sorted(images),
+        }
     
     def _generate_todo_warning(self, source_path: Path, content_length: int) -> str:
         """Generate TODO warning for minimal content"""
@@ -219,36 +1401,115 @@ class ReadmeSynchronizer:
     This page needs significant content. The source README currently contains only {content_length} characters.
     See the documentation needs report for details on what content is required."""
     
-    def _fix_image_paths(self, content: str, source_path: Path, target_path: Path, dry_run: bool = False) -> str:
-        """Fix relative image paths to work from the target location"""
-        
-        for i, pattern in enumerate(self.image_patterns):
-            for match in pattern.finditer(content):
-                if i == 0:  # Markdown syntax: ![alt](path)
-                    original_path = match.group(2)
-                    full_match = match.group(0)
-                else:  # HTML syntax: <img src="path" ...>
-                    original_path = match.group(2)
-                    full_match = match.group(0)
-                
-                # Skip URLs and absolute paths
-                if original_path.startswith(('http://', 'https://', '/', '#')):
-                    continue
-                
-                # Convert the relative path
-                fixed_path = self._convert_relative_path(original_path, source_path, target_path, dry_run)
-                
-                # Replace in content
-                if i == 0:  # Markdown syntax
-                    new_match = f'![{match.group(1)}]({fixed_path})'
-                else:  # HTML syntax - preserve other attributes
-                    new_match = full_match.replace(original_path, fixed_path)
-                
-                content = content.replace(full_match, new_match)
+    @staticmethod
+    def _image_path_group(match: re.Match) -> str:
+        """Return the name of the group holding the image path in a match of image_pattern"""
+        if match.group('md_path') is not None:
+            return 'md_path'
+        if match.group('dq_path') is not None:
+            return 'dq_path'
+        return 'sq_path'
+    
+    @staticmethod
+    def _reference_group(match: re.Match) -> str:
+        """Return the name of the group holding the path in a match of reference_pattern"""
+        return match.lastgroup
+    
+    def _fix_image_paths(self, content: str, source_path: Path, target_path: Path, dry_run: bool = False,
+                         image_deps: Optional[List[Tuple[Path, Optional[Path]]]] = None) -> str:
+        """Fix relative image paths and links to work from the target location
+        
+        References inside fenced code blocks are left alone.
+        """
+        # Each distinct path is converted (and its image copied) once per document
+        converted: Dict[Tuple[bool, str], str] = {}
+        
+        def convert(original_path: str, is_link: bool) -> str:
+            fixed_path = converted.get((is_link, original_path))
+            if fixed_path is None:
+                if is_link:
+                    fixed_path = self._convert_relative_link(original_path, source_path, target_path)
+                else:
+                    fixed_path = self._convert_relative_path(original_path, source_path, target_path, dry_run,
+                                                             image_deps)
+                converted[(is_link, original_path)] = fixed_path
+            return fixed_path
         
-        return content
+        def replace(match: re.Match) -> str:
+            group = self._reference_group(match)
+            original_path = match.group(group)
+            
+            # Skip URLs and absolute paths
+            if original_path.startswith(('http://', 'https://', '/', '#')):
+                return match.group(0)
+            
+            fixed_path = convert(original_path, group in ('link_path', 'dq_href', 'sq_href'))
+            
+            if group == 'md_path':  # Markdown syntax
+                return f'![{match.group("alt")}]({fixed_path})'
+            
+            # Links and HTML syntax - replace only the path and preserve text, titles and other attributes
+            start, end = match.span(group)
+            full_match = match.group(0)
+            prefix = full_match[:start - match.start()]
+            if group == 'link_path':
+                # The link text may itself be an image, as in [![alt](image.png)](page.md)
+                prefix = self.reference_pattern.sub(replace, prefix)
+            return prefix + fixed_path + full_match[end - match.start():]
+        
+        def replace_definition(match: re.Match) -> str:
+            original_path = self._definition_path(match)
+            if original_path.startswith(('http://', 'https://', '/', '#')):
+                return match.group(0)
+            
+            # A definition pointing at an image is used by image references, as in ![alt][logo]
+            is_image = os.path.splitext(original_path.partition('#')[0])[1].lower() in self.image_extensions
+            fixed_path = convert(original_path, not is_image)
+            group = 'angle_path' if match.group('angle_path') is not None else 'def_path'
+            start, end = match.span(group)
+            full_match = match.group(0)
+            return full_match[:start - match.start()] + fixed_path + full_match[end - match.start():]
+        
+        chunks = []
+        for chunk, in_code in _markdown_chunks(content):
+            if not in_code:
+                chunk = self.reference_pattern.sub(replace, chunk)
+                if ']:' in chunk:
+                    chunk = LINK_DEFINITION_PATTERN.sub(replace_definition, chunk)
+            chunks.append(chunk)
+        return ''.join(chunks)
+    
+    @staticmethod
+    def _definition_path(match: re.Match) -> str:
+        """Return the path of a match of LINK_DEFINITION_PATTERN, without its angle brackets"""
+        return match.group('angle_path') if match.group('angle_path') is not None else match.group('def_path')
     
-    def _convert_relative_path(self, rel_path: str, source_path: Path, target_path: Path, dry_run: bool = False) -> str:
+    def _convert_relative_link(self, link: str, source_path: Path, target_path: Path) -> str:
+        """Point a relative link at the synced page of its target, or at GitHub if it is not synced"""
+        # Other schemes (mailto:, ftp:, ...) are left alone
+        if URL_SCHEME_PATTERN.match(link):
+            return link
+        
+        path, hash_mark, fragment = link.partition('#')
+        abs_path = (source_path.parent / path).resolve()
+        
+        target_page = self.target_pages.get(abs_path) or self.target_pages.get(abs_path / 'README.md')
+        if target_page is not None:
+            # MkDocs resolves links between .md files, including the pretty URL of the target page
+            relative = Path(os.path.relpath(target_page, target_path.parent)).as_posix()
+            return relative + hash_mark + fragment
+        
+        try:
+            repo_name = abs_path.relative_to(self.base_path).parts[0]
+        except (ValueError, IndexError):
+            return link  # Outside the source repositories
+        if repo_name not in self.repo_urls:
+            return link
+        
+        return self._get_repo_url(abs_path) + hash_mark + fragment
+    
+    def _convert_relative_path(self, rel_path: str, source_path: Path, target_path: Path, dry_run: bool = False,
+                               image_deps: Optional[List[Tuple[Path, Optional[Path]]]] = None) -> str:
         """Convert a relative path from source to target location"""
         # Resolve the absolute path from the source file's perspective
         source_dir = source_path.parent
@@ -260,23 +1521,21 @@ class ReadmeSynchronizer:
             
             # For any image file, copy it to docs/assets/images
             if abs_path.suffix.lower() in self.image_extensions:
-                # Ensure the assets directory exists
-                assets_dir = self.base_path / 'docs' / 'assets' / 'images'
+                assets_dir = self.assets_dir
+                image_exists = self._source_exists(abs_path)
+                dest_path = self._asset_dest(abs_path) if image_exists else assets_dir / abs_path.name
                 
                 if not dry_run:
-                    assets_dir.mkdir(parents=True, exist_ok=True)
-                    
                     # Copy the image if it exists
-                    if abs_path.exists():
-                        dest_path = assets_dir / abs_path.name
-                        
-                        # Only copy if source is newer or dest doesn't exist
-                        if not dest_path.exists() or abs_path.stat().st_mtime > dest_path.stat().st_mtime:
-                            shutil.copy2(abs_path, dest_path)
+                    if image_exists:
+                        if self._store_image(abs_path, dest_path):
                             logger.info(f"Copied image: {abs_path} -> {dest_path}")
+                    
+                    # Missing images are recorded too, so the page is re-synced once they appear
+                    if image_deps is not None:
+                        image_deps.append((abs_path, dest_path if image_exists else None))
                 else:
-                    if abs_path.exists():
-                        dest_path = assets_dir / abs_path.name
+                    if image_exists:
                         logger.info(f"  [DRY RUN] Would copy image: {abs_path} -> {dest_path}")
                 
                 # Calculate relative path from target document to assets
@@ -293,7 +1552,7 @@ class ReadmeSynchronizer:
                 ups = '../' * depth_from_docs
                 
                 # The path to assets from docs root
-                assets_from_docs = f'assets/images/{abs_path.name}'
+                assets_from_docs = f'assets/images/{dest_path.name}'
                 
                 return ups + assets_from_docs
             
@@ -304,7 +1563,7 @@ class ReadmeSynchronizer:
             except ValueError:
                 # If relative_to fails, fall back to os.path.relpath
                 return os.path.relpath(abs_path, target_dir)
-            
+        
         except ValueError:
             # Path is outside the repo, return as-is
             return rel_path
@@ -325,7 +1584,7 @@ class ReadmeSynchronizer:
         
         if len(parts) > 1:
             file_path = '/'.join(parts[1:])
-            return f"{base_url}/blob/main/{file_path}"
+            return f"{base_url}/blob/{self.source_refs.get(repo_name, 'main')}/{file_path}"
         else:
             return base_url
     
@@ -339,7 +1598,7 @@ class ReadmeSynchronizer:
                         # Remove markdown formatting from title
                         title = line[2:].strip()
                         # Remove markdown links - extract just the text
-                        title = re.sub(r'\[([^\]]+)\]\([^)]+\)', r'\1', title)
+                        title = MARKDOWN_LINK_PATTERN.sub(r'\1', title)
                         return title
         except Exception:
             pass
@@ -369,13 +1628,15 @@ class ReadmeSynchronizer:
     
     def _generate_documentation_needs_report(self, dry_run: bool = False) -> None:
         """Generate a report of documentation that needs to be written"""
-        report_path = self.base_path / 'docs' / 'documentation-needs-report.md'
+        from datetime import datetime
+        report_path = self.report_path
+        generated_line = f"Generated: {datetime.now().isoformat()}"
         
         content = f"""# Documentation Needs Report
 
 This report lists all README files that need additional content from the engineering team.
 
-Generated: {datetime.now().isoformat()}
+{generated_line}
 
 ## Files Needing Documentation
 
@@ -385,7 +1646,7 @@ Total files with minimal content: {len(self.stats['needs_content'])}
 |------------|---------------------|----------------|---------|
 """
         
-        for item in sorted(self.stats['needs_content'], key=lambda x: x['length']):
+        for item in sorted(self.stats['needs_content'], key=lambda x: (x['length'], x['source'])):
             status = "❌ Critical" if item['length'] < self.critical_threshold else "⚠️ Needs Expansion"
             content += f"| `{item['source']}` | `{item['target']}` | {item['length']} chars | {status} |\n"
         
@@ -411,21 +1672,25 @@ Total files with minimal content: {len(self.stats['needs_content'])}
         
         # Write report
         if not dry_run:
-            with open(report_path, 'w', encoding='utf-8') as f:
-                f.write(content)
-            logger.info(f"\nDocumentation needs report generated: {report_path}")
+            # An unchanged report keeps its timestamp, so it is not rewritten (which would trigger a rebuild)
+            if self.output.exists(report_path):
+                previous = self.output.read_text(report_path)
+                if REPORT_TIMESTAMP_PATTERN.sub('', previous) == REPORT_TIMESTAMP_PATTERN.sub('', content):
+                    content = previous
+            if self._write_if_changed(report_path, content):
+                logger.info(f"\nDocumentation needs report generated: {report_path}")
+            else:
+                logger.info(f"\nDocumentation needs report unchanged: {report_path}")
         else:
             logger.info(f"\n[DRY RUN] Would generate documentation needs report: {report_path}")
             logger.info(f"\n--- Documentation Needs Report (DRY RUN) ---")
             print(content)
             logger.info(f"--- End of Report ---")
     
-    def _fix_all_images_in_docs(self, dry_run: bool = False) -> None:
-        """Fix broken image references in all markdown files"""
-        docs_dir = self.base_path / 'docs'
-        
-        # Find all markdown files
-        markdown_files = list(docs_dir.rglob("*.md"))
+    def _fix_all_images_in_docs(self, dry_run: bool = False, jobs: int = 1) -> None:
+        """Fix broken image references in all markdown files, on a thread pool if jobs > 1"""
+        # Find all markdown files, including pages synced earlier in this run
+        markdown_files = self._docs_markdown_files()
         
         # Get source repositories
         source_repos = []
@@ -441,16 +1706,23 @@ Total files with minimal content: {len(self.stats['needs_content'])}
         logger.info(f"Found {len(markdown_files)} markdown files to check")
         logger.info(f"Source repositories: {', '.join(repo.name for repo in source_repos)}")
         
+        # Index every file in the source repositories once instead of walking them per image
+        with self.metrics.phase('build_image_index'):
+            image_index = self._build_image_index(source_repos)
+        
         total_fixed = 0
         total_changes = 0
         files_processed = 0
         
-        for file_path in markdown_files:
-            # Skip README files in the docs directory itself
-            if file_path.name == "README.md":
-                continue
-            
-            fixed, changes = self._fix_images_in_file(file_path, source_repos, dry_run)
+        # Skip README files in the docs directory itself
+        files_to_fix = [file_path for file_path in markdown_files if file_path.name != "README.md"]
+        
+        if jobs > 1:
+            results = self._fix_images_in_files_parallel(files_to_fix, image_index, dry_run, jobs)
+        else:
+            results = (self._fix_images_in_file(file_path, image_index, dry_run) for file_path in files_to_fix)
+        
+        for fixed, changes in results:
             if fixed > 0:
                 total_fixed += fixed
                 total_changes += changes
@@ -462,107 +1734,237 @@ Total files with minimal content: {len(self.stats['needs_content'])}
         logger.info(f"Files with fixes: {files_processed}")
         logger.info(f"Images fixed: {total_fixed}")
         logger.info(f"References updated: {total_changes}")
+        if self.stats['ambiguous_images']:
+            logger.info(f"Ambiguous image names: {self.stats['ambiguous_images']}")
     
-    def _fix_images_in_file(self, file_path: Path, source_repos: List[Path], dry_run: bool = False) -> Tuple[int, int]:
-        """Fix broken image references in a single file"""
-        logger.info(f"Checking: {file_path.relative_to(self.base_path / 'docs')}")
-        
-        # Find image references
-        image_refs = self._find_image_references(file_path)
+    def _fix_images_in_files_parallel(self, files: List[Path], image_index: Dict[str, List[Path]],
+                                      dry_run: bool, jobs: int) -> Iterator[Tuple[int, int]]:
+        """Fix images in many files on a bounded thread pool, yielding results in file order
         
-        if not image_refs:
-            return 0, 0
+        Workers share the read-only image index. Copies to the same docs asset are serialized
+        by its copy lock, so the first worker stores it and the others find it in place.
+        """
+        logger.info(f"Fixing images with {jobs} parallel workers")
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            futures = [
+                executor.submit(_log_buffer.capture, self._fix_images_in_file, file_path, image_index, dry_run)
+                for file_path in files
+            ]
+            
+            # Replay each file's log lines as one group, in file order
+            for future in futures:
+                result, records = future.result()
+                for record in records:
+                    logger.handle(record)
+                yield result
+    
+    def _fix_images_in_file(self, file_path: Path, image_index: Dict[str, List[Path]],
+                            dry_run: bool = False) -> Tuple[int, int]:
+        """Fix broken image references in a single file, scanning and rewriting it in one streaming pass
         
-        logger.info(f"  Found {len(image_refs)} image reference(s)")
+        References inside fenced code blocks are left alone. Returns the number of distinct image
+        paths that were fixed and the number of references that were rewritten.
+        """
+        logger.info(f"Checking: {file_path.relative_to(self.base_path / 'docs')}")
         
-        updates = {}
-        fixed = 0
+        # Each distinct path is resolved (and its image copied) once per file
+        resolved: Dict[str, Optional[str]] = {}
+        changes = 0
+        line_num = 0
         
-        for image_path, line_num in image_refs:
-            logger.info(f"  Line {line_num}: {image_path}")
-            
-            # Find source image
-            source_image = self._find_source_image(image_path, source_repos)
+        def replace(match: re.Match) -> str:
+            nonlocal changes
+            group = self._image_path_group(match)
+            image_path = match.group(group)
             
-            if not source_image:
-                logger.warning(f"    Source image not found: {os.path.basename(image_path)}")
-                continue
+            if image_path not in resolved:
+                logger.info(f"  Line {line_num}: {image_path}")
+                resolved[image_path] = self._resolve_docs_image(image_path, file_path, image_index, dry_run)
+            new_path = resolved[image_path]
+            if new_path is None or new_path == image_path:
+                return match.group(0)
             
-            logger.info(f"    Found source: {source_image}")
-            
-            # Determine target path and copy image
-            target_path = self.base_path / 'docs' / 'assets' / 'images' / source_image.name
-            
-            if self._copy_image_to_docs(source_image, target_path, dry_run):
-                # Get relative path from file to target
-                new_path = self._get_relative_path_for_docs(target_path, file_path)
-                updates[image_path] = new_path
-                fixed += 1
+            changes += 1
+            start, end = match.span(group)
+            full_match = match.group(0)
+            return full_match[:start - match.start()] + new_path + full_match[end - match.start():]
         
-        # Update file with new paths
-        changes = self._update_file_image_references(file_path, updates, dry_run)
+        source_file = self.output.resolve(file_path)
+        self.metrics.count('bytes_read', source_file.stat().st_size)
+        lines: List[str] = []
+        with open(source_file, 'r', encoding='utf-8', newline='') as f:
+            for line_num, (line, in_code) in enumerate(_fenced_lines(f), 1):
+                if not in_code and ('](' in line or '<img' in line):
+                    line = self.image_pattern.sub(replace, line)
+                lines.append(line)
         
+        if changes and not dry_run:
+            self.output.write_text(file_path, ''.join(lines))
+        if changes:
+            logger.info(f"  Updated {changes} reference(s)")
+        
+        fixed = sum(1 for new_path in resolved.values() if new_path is not None)
         return fixed, changes
     
-    def _find_image_references(self, file_path: Path) -> List[Tuple[str, int]]:
-        """Find all image references in a markdown file"""
-        image_refs = []
-        
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            lines = content.split('\n')
-            
-            for line_num, line in enumerate(lines, 1):
-                for i, pattern in enumerate(self.image_patterns):
-                    for match in pattern.finditer(line):
-                        if i == 0:  # Markdown syntax: ![alt](path)
-                            image_path = match.group(2)
-                        else:  # HTML syntax: src="path"
-                            image_path = match.group(2)
-                        
-                        # Skip URLs
-                        if image_path.startswith(('http://', 'https://')):
-                            continue
-                        
-                        # Check if it's a broken /assets/ path or relative path that needs fixing
-                        if image_path.startswith('/assets/'):
-                            # Check if this image actually exists in docs
-                            full_path = self.base_path / 'docs' / image_path.lstrip('/')
-                            if not full_path.exists():
-                                # This is a broken reference - needs fixing
-                                image_refs.append((image_path, line_num))
-                        else:
-                            # This is a relative path that might need fixing
-                            image_refs.append((image_path, line_num))
-        
-        return image_refs
-    
-    def _find_source_image(self, image_path: str, source_repos: List[Path]) -> Optional[Path]:
-        """Find the actual image file in source repositories"""
-        # Extract just the filename from the path
-        image_filename = os.path.basename(image_path)
+    def _resolve_docs_image(self, image_path: str, file_path: Path, image_index: Dict[str, List[Path]],
+                            dry_run: bool) -> Optional[str]:
+        """Find the source of an image referenced from a docs page, copy it and return the new path
+        
+        Returns None if the reference should be left as it is (URLs, existing assets, unknown images).
+        """
+        # Skip URLs
+        if image_path.startswith(('http://', 'https://')):
+            return None
+        
+        # /assets/ paths only need fixing if the image does not exist in docs
+        if image_path.startswith('/assets/'):
+            full_path = self.base_path / 'docs' / image_path.lstrip('/')
+            if self.output.exists(full_path):
+                return None
+        
+        # References fixed by an earlier run point at an existing docs asset (the page-relative
+        # prefix depends on pretty URLs, so only the part under assets/images/ is checked)
+        elif '/assets/images/' in image_path:
+            asset_name = image_path.split('/assets/images/', 1)[1]
+            if self.output.exists(self.assets_dir / asset_name):
+                return None
+        
+        # Find source image
+        with self.metrics.phase('find_source_image'):
+            source_image = self._find_source_image(image_path, image_index)
+        
+        if not source_image:
+            logger.warning(f"    Source image not found: {os.path.basename(image_path)}")
+            return None
+        
+        logger.info(f"    Found source: {source_image}")
+        if not dry_run:
+            self._materialize([source_image])
+        
+        # Determine target path and copy image
+        target_path = self._asset_dest(source_image)
+        if not self._copy_image_to_docs(source_image, target_path, dry_run):
+            return None
+        
+        # Get relative path from file to target
+        return self._get_relative_path_for_docs(target_path, file_path)
+    
+    def _build_image_index(self, source_repos: List[Path]) -> Dict[str, List[Path]]:
+        """Build an index from file name to candidate paths across all source repositories"""
+        # Sparse working trees change as files are added, so their index is not persisted
+        cached = None if self.sparse_checkouts or self.source_refs else self._load_image_index(source_repos)
+        if cached is not None:
+            logger.info(f"Using cached image index ({len(cached)} file names)")
+            self.metrics.count('image_index_cache_hits')
+            return cached
+        
+        index: Dict[str, List[Path]] = {}
+        dir_mtimes: Dict[str, int] = {}
         
-        # Search in all source repositories
         for repo in source_repos:
+            if repo.name in self.source_refs:
+                tracked = self._git_source(repo.name).files
+            elif repo.name in self.sparse_checkouts:
+                tracked = self.sparse_checkouts[repo.name].tracked_files()
+            else:
+                tracked = None
+            if tracked is not None:
+                # Repositories read from git and sparse repositories are (mostly) not on disk, so the
+                # files of their commit are indexed
+                for rel_path in tracked:
+                    *dirs, name = rel_path.split('/')
+                    if not any(d.startswith('.') or d in ['node_modules', '__pycache__'] for d in dirs):
+                        index.setdefault(name, []).append(repo / rel_path)
+                continue
+            
             for root, dirs, files in os.walk(repo):
                 # Skip hidden directories and common non-image directories
                 dirs[:] = [d for d in dirs if not d.startswith('.') and d not in ['node_modules', '__pycache__']]
                 
-                if image_filename in files:
-                    return Path(root) / image_filename
+                root_path = Path(root)
+                dir_mtimes[str(root_path.relative_to(self.base_path))] = root_path.stat().st_mtime_ns
+                for name in files:
+                    index.setdefault(name, []).append(root_path / name)
+        
+        logger.info(f"Indexed {sum(len(paths) for paths in index.values())} files in source repositories")
+        if not self.sparse_checkouts and not self.source_refs:
+            self._save_image_index(source_repos, index, dir_mtimes)
+        return index
+    
+    def _load_image_index(self, source_repos: List[Path]) -> Optional[Dict[str, List[Path]]]:
+        """Load the persisted image index if no indexed directory has changed since it was built"""
+        if not self.use_cache or not self.image_index_path.exists():
+            return None
+        
+        try:
+            with open(self.image_index_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+        
+        if cached.get('repos') != [repo.name for repo in source_repos]:
+            return None
         
-        return None
+        # Adding, removing or renaming a file updates the mtime of its directory
+        for rel_dir, mtime_ns in cached.get('dirs', {}).items():
+            try:
+                if (self.base_path / rel_dir).stat().st_mtime_ns != mtime_ns:
+                    return None
+            except OSError:
+                return None
+        
+        return {
+            name: [self.base_path / rel_path for rel_path in rel_paths]
+            for name, rel_paths in cached.get('files', {}).items()
+        }
+    
+    def _save_image_index(self, source_repos: List[Path], index: Dict[str, List[Path]],
+                          dir_mtimes: Dict[str, int]) -> None:
+        """Persist the image index together with the mtimes of the directories it covers"""
+        if not self.use_cache:
+            return
+        
+        cached = {
+            'repos': [repo.name for repo in source_repos],
+            'dirs': dir_mtimes,
+            'files': {
+                name: [str(path.relative_to(self.base_path)) for path in paths]
+                for name, paths in index.items()
+            },
+        }
+        atomic_write_text(self.image_index_path, json.dumps(cached))
+    
+    def _find_source_image(self, image_path: str, image_index: Dict[str, List[Path]]) -> Optional[Path]:
+        """Find the actual image file in source repositories"""
+        # Extract just the filename from the path
+        image_filename = os.path.basename(image_path)
+        
+        candidates = image_index.get(image_filename)
+        if not candidates:
+            return None
+        
+        repos = {candidate.relative_to(self.base_path).parts[0] for candidate in candidates}
+        if len(repos) == 1:
+            return candidates[0]
+        
+        # Prefer candidates whose path ends with the referenced path, e.g. "images/foo.png"
+        ref_suffix = '/' + image_path.lstrip('./').lstrip('/')
+        matching = [c for c in candidates if c.as_posix().endswith(ref_suffix)]
+        matching_repos = {c.relative_to(self.base_path).parts[0] for c in matching}
+        if len(matching_repos) == 1:
+            return matching[0]
+        
+        self._count('ambiguous_images')
+        logger.warning(f"    Ambiguous image name '{image_filename}' exists in multiple repositories "
+                       f"({', '.join(sorted(repos))}); using {candidates[0]}")
+        return candidates[0]
     
     def _copy_image_to_docs(self, source: Path, target: Path, dry_run: bool = False) -> bool:
         """Copy image file to docs assets directory"""
         try:
-            # Ensure target directory exists
-            target.parent.mkdir(parents=True, exist_ok=True)
-            
             if not dry_run:
-                # Only copy if source is newer or dest doesn't exist
-                if not target.exists() or source.stat().st_mtime > target.stat().st_mtime:
-                    shutil.copy2(source, target)
+                if self._store_image(source, target):
                     logger.info(f"    Copied {source.name} to {target}")
             else:
                 logger.info(f"    [DRY RUN] Would copy {source.name} to {target}")
@@ -586,37 +1988,195 @@ Total files with minimal content: {len(self.stats['needs_content'])}
         assets_from_docs = f'assets/images/{target_path.name}'
         
         return ups + assets_from_docs
+
+
+
+def version_manifest(sync_config: SyncConfig, names: Iterable[str]) -> List[Dict]:
+    """Build the version switcher manifest (docs/versions.json) listing the given versions in config order
     
-    def _update_file_image_references(self, file_path: Path, updates: Dict[str, str], dry_run: bool = False) -> int:
-        """Update image references in a file"""
-        if not updates:
-            return 0
-        
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        changes = 0
+    Entries use the fields of mike's versions.json (version, title, aliases) plus the path of each
+    version's pages relative to the site root.
+    """
+    names = set(names)
+    return [
+        {'version': version['name'], 'title': version['title'], 'aliases': version['aliases'],
+         'path': f"{version['name']}/"}
+        for version in sync_config.versions if version['name'] in names
+    ]
+
+
+def sync_versions(config_path: Path, names: Optional[List[str]] = None, jobs: int = 1, dry_run: bool = False,
+                  gc_assets: bool = False, use_cache: bool = True, optimize_images: bool = False,
+                  base_path: Optional[Path] = None) -> List[ReadmeSynchronizer]:
+    """Sync the configured documentation versions (all, or the named ones) into docs/<version>/
+    
+    Each version reads the source repositories from git at its own refs, has its own sync cache
+    and is synced on its own thread (with `jobs` README workers). All versions stage into one
+    output transaction and share the content-addressed image store, so an image that several
+    versions use is read, optimized and stored once. Their pages and the version switcher
+    manifest are committed together. Returns the synchronizer of each version.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    
+    base_path = base_path or Path(os.getcwd())
+    sync_config = load_sync_config(config_path, base_path / '.cache' / 'config')
+    if not sync_config.versions:
+        raise ConfigError(f"{config_path}: no 'versions' configured")
+    if sync_config.asset_store != 'content-addressed':
+        raise ConfigError(f"{config_path}: versions share images only with assets.store: content-addressed")
+    names = names or [version['name'] for version in sync_config.versions]
+    
+    synchronizers: List[ReadmeSynchronizer] = []
+    for name in names:
+        synchronizer = ReadmeSynchronizer(config_path, use_cache=use_cache, base_path=base_path, version=name)
+        if synchronizers:
+            synchronizer.share_output(synchronizers[0])
+        elif optimize_images:
+            synchronizer.enable_image_optimization()
+        synchronizers.append(synchronizer)
+    primary = synchronizers[0]
+    
+    logger.info(f"Starting README synchronization of versions: {', '.join(names)}")
+    try:
+        with ThreadPoolExecutor(max_workers=len(synchronizers)) as executor:
+            futures = [executor.submit(_log_buffer.capture, synchronizer._sync_sources, dry_run, jobs)
+                       for synchronizer in synchronizers]
+            # Replay each version's log lines as one group, in configuration order
+            for name, future in zip(names, futures):
+                logger.info(f"\nVersion {name}")
+                _, records = future.result()
+                for record in records:
+                    logger.handle(record)
         
-        # Sort updates by length (longest first) to avoid partial replacements
-        sorted_updates = sorted(updates.items(), key=lambda x: len(x[0]), reverse=True)
+        if not dry_run:
+            primary._save_asset_manifest()
         
-        for old_path, new_path in sorted_updates:
-            # Count occurrences
-            occurrences = content.count(old_path)
-            if occurrences > 0:
-                content = content.replace(old_path, new_path)
-                changes += occurrences
-                logger.info(f"    Replaced {occurrences} occurrence(s) of '{old_path}' with '{new_path}'")
+        # Pruning keeps assets that any staged page references, so it waits until every version is staged
+        for synchronizer in synchronizers:
+            with synchronizer.metrics.phase('prune'):
+                synchronizer._prune_stale_outputs(dry_run)
+            if synchronizer.stats['needs_content']:
+                with synchronizer.metrics.phase('report'):
+                    synchronizer._generate_documentation_needs_report(dry_run)
         
-        if changes > 0 and not dry_run:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+        if gc_assets:
+            with primary.metrics.phase('gc_assets'):
+                primary._gc_assets(dry_run)
         
-        return changes
+        # The switcher lists every configured version that has pages after this run
+        docs_dir = base_path / 'docs'
+        available = [version['name'] for version in sync_config.versions
+                     if version['name'] in names or primary.output.exists(docs_dir / version['name'])]
+        manifest_path = docs_dir / 'versions.json'
+        manifest = json.dumps(version_manifest(sync_config, available), indent=2) + '\n'
+        if dry_run:
+            logger.info(f"\n[DRY RUN] Would write version switcher manifest {manifest_path} ({', '.join(available)})")
+        else:
+            primary._write_if_changed(manifest_path, manifest)
+            primary._commit_output()
+            for synchronizer in synchronizers[1:]:
+                synchronizer._save_manifest()
+    except BaseException:
+        primary.output.rollback()
+        raise
+    finally:
+        for synchronizer in synchronizers:
+            synchronizer.close_git_sources()
+    
+    logger.info("\nSynchronization complete!")
+    for name, synchronizer in zip(names, synchronizers):
+        logger.info(f"\nVersion {name}:")
+        synchronizer._log_summary()
+    return synchronizers
+
+# MkDocs hooks
+#
+# mkdocs.yml registers this module under `hooks:`, so `mkdocs build` and `mkdocs serve`
+# synchronize READMEs in-process before each build. The synchronizer is kept warm across
+# serve rebuilds and only re-syncs entries whose sources changed. Set DISABLE_README_SYNC=true
+# to build from the already-synced files.
+
+_hook_synchronizer: Optional[ReadmeSynchronizer] = None
+
+# Format of the log messages, for both the command line and the hooks
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+
+def _readme_sync_disabled() -> bool:
+    """Check whether README sync has been disabled through the environment"""
+    return os.environ.get('DISABLE_README_SYNC', '').lower() in ('1', 'true', 'yes')
+
+
+def on_config(config):
+    """Create the synchronizer once per process (and again when the sync config changes), relative to mkdocs.yml"""
+    global _hook_synchronizer
+    
+    # MkDocs only handles its own loggers; no-op if logging was configured already
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+    
+    if _readme_sync_disabled():
+        return config
+    
+    base_path = Path(config['config_file_path']).resolve().parent
+    config_path = base_path / 'scripts' / 'readme-sync-config.yml'
+    if not config_path.exists():
+        logger.warning(f"README sync skipped: configuration file not found: {config_path}")
+        _hook_synchronizer = None
+        return config
+    
+    # Serve rebuilds keep the warm synchronizer as long as load_sync_config returns the same (unmodified) config
+    if (_hook_synchronizer is not None
+            and load_sync_config(config_path, base_path / '.cache' / 'config') is _hook_synchronizer.sync_config):
+        return config
+    
+    _hook_synchronizer = None
+    synchronizer = ReadmeSynchronizer(config_path, base_path=base_path)
+    missing_repos = [name for name in synchronizer.repo_urls if not (base_path / name).is_dir()]
+    if missing_repos:
+        logger.warning(f"README sync skipped (missing {', '.join(missing_repos)}): "
+                       f"building from previously synced files")
+        return config
+    
+    _hook_synchronizer = synchronizer
+    return config
+
+
+def on_serve(server, config, builder):
+    """Make `mkdocs serve` rebuild (and therefore re-sync) when a source README or image changes"""
+    if _hook_synchronizer is None or _readme_sync_disabled():
+        return server
+    
+    # The directory of the sync config is watched too, so config edits take effect on the next rebuild
+    directories = {path.parent for path in _hook_synchronizer._watch_dependents()}
+    directories.add(_hook_synchronizer.config_path.parent)
+    for directory in sorted(directories):
+        if directory.is_dir():
+            server.watch(str(directory), recursive=False)
+    return server
+
+
+def on_pre_build(config) -> None:
+    """Sync changed READMEs into docs/ before MkDocs collects the documentation files"""
+    if _readme_sync_disabled():
+        logger.info("README sync disabled (DISABLE_README_SYNC is set)")
+        return
+    
+    if _hook_synchronizer is None:
+        return
+    
+    start = time.perf_counter()
+    changed = _hook_synchronizer.sync_changed()
+    stats = _hook_synchronizer.stats
+    logger.info(f"README sync: {changed} changed, {stats['written']} written, "
+                f"{stats['errors']} errors in {time.perf_counter() - start:.2f}s")
 
 
 def main() -> int:
     """Main entry point"""
+    import argparse
+    
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+    
     parser = argparse.ArgumentParser(description='README synchronization to documentation')
     parser.add_argument(
         '--config',
@@ -633,18 +2193,150 @@ def main() -> int:
         action='store_true',
         help='Also scan and fix broken images in all markdown files'
     )
-
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=1,
+        metavar='N',
+        help='Number of README files to process concurrently (default: 1)'
+    )
+    parser.add_argument(
+        '--gc-assets',
+        action='store_true',
+        help='Delete images written by the content-addressed asset store that no page references any more'
+    )
+    parser.add_argument(
+        '--optimize-images',
+        action='store_true',
+        help='Losslessly recompress synced PNGs and generate the configured WebP/downscaled variants (needs Pillow)'
+    )
+    parser.add_argument(
+        '--ref',
+        action='append',
+        default=[],
+        metavar='[REPO=]REF',
+        help='Read the files of REPO (every source repository if omitted) from git at branch, tag or commit REF '
+             'instead of its working tree; overrides the ref in the configuration (repeatable)'
+    )
+    parser.add_argument(
+        '--versions',
+        nargs='*',
+        metavar='NAME',
+        help="Sync the documentation versions configured under 'versions' (all, or the named ones) "
+             "into docs/<NAME>/ concurrently, with shared images and a docs/versions.json switcher manifest"
+    )
+    parser.add_argument(
+        '--sparse',
+        action='store_true',
+        help='Limit the source repositories (git clones) to the configured READMEs and the images they '
+             'reference with git sparse checkout, adding images as references are found'
+    )
+    parser.add_argument(
+        '--watch',
+        action='store_true',
+        help='After syncing, keep running and re-sync READMEs whenever a source file or image changes'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Ignore the incremental sync cache and reprocess every README'
+    )
+    parser.add_argument(
+        '--metrics-out',
+        type=Path,
+        metavar='PATH',
+        help='Write per-phase and per-file timings, byte counts and cache statistics to PATH as JSON'
+    )
+    parser.add_argument(
+        '--profile',
+        type=Path,
+        metavar='PATH',
+        help='Run under cProfile and dump the stats to PATH (worker threads of --jobs are not profiled)'
+    )
     
     args = parser.parse_args()
     
+    if args.jobs < 1:
+        logger.error(f"--jobs must be at least 1, got {args.jobs}")
+        return 1
+    
+    if args.versions is not None and (args.watch or args.ref or args.sparse or args.fix_all_images
+                                      or args.metrics_out or args.profile):
+        logger.error("--versions cannot be combined with --watch, --ref, --sparse, --fix-all-images, "
+                     "--metrics-out or --profile")
+        return 1
+    
+    if args.sparse and args.dry_run:
+        logger.error("--sparse cannot be combined with --dry-run (it changes the working trees of the sources)")
+        return 1
+    
+    if args.watch and args.ref:
+        logger.error("--ref cannot be combined with --watch (files read at a ref do not change)")
+        return 1
+    
+    if args.watch and (args.metrics_out or args.profile):
+        logger.error("--metrics-out and --profile cannot be combined with --watch")
+        return 1
+    
     config_path = Path(args.config)
     if not config_path.exists():
         logger.error(f"Configuration file not found: {config_path}")
         return 1
     
+    if args.versions is not None:
+        try:
+            sync_versions(config_path, args.versions, jobs=args.jobs, dry_run=args.dry_run, gc_assets=args.gc_assets,
+                          use_cache=not args.no_cache, optimize_images=args.optimize_images)
+            return 0
+        except Exception as e:
+            logger.error(f"Synchronization failed: {e}")
+            return 1
+    
     try:
-        synchronizer = ReadmeSynchronizer(config_path)
-        synchronizer.sync_all(dry_run=args.dry_run, fix_all_images=args.fix_all_images)
+        synchronizer = ReadmeSynchronizer(config_path, use_cache=not args.no_cache)
+        for ref_arg in args.ref:
+            repo_name, separator, ref = ref_arg.partition('=')
+            if not separator:
+                synchronizer.source_refs.update(dict.fromkeys(synchronizer.repo_urls, ref_arg))
+            elif repo_name in synchronizer.repo_urls:
+                synchronizer.source_refs[repo_name] = ref
+            else:
+                logger.error(f"--ref {ref_arg}: unknown repository '{repo_name}'")
+                return 1
+        if args.optimize_images:
+            synchronizer.enable_image_optimization()
+        if args.sparse:
+            synchronizer.enable_sparse_checkout()
+        if args.watch:
+            synchronizer.watch(jobs=args.jobs)
+            return 0
+        
+        profiler = None
+        if args.profile:
+            import cProfile
+            profiler = cProfile.Profile()
+            profiler.enable()
+        try:
+            synchronizer.sync_all(dry_run=args.dry_run, fix_all_images=args.fix_all_images, jobs=args.jobs,
+                                  gc_assets=args.gc_assets)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                args.profile.parent.mkdir(parents=True, exist_ok=True)
+                profiler.dump_stats(str(args.profile))
+                logger.info(f"Profile written to {args.profile} (inspect with: python -m pstats {args.profile})")
+        
+        if args.metrics_out:
+            synchronizer.write_metrics(args.metrics_out, {
+                'dry_run': args.dry_run,
+                'fix_all_images': args.fix_all_images,
+                'jobs': args.jobs,
+                'gc_assets': args.gc_assets,
+                'optimize_images': synchronizer.image_optimizer is not None,
+                'sparse': args.sparse,
+                'source_refs': synchronizer.source_refs,
+                'use_cache': not args.no_cache,
+            })
         return 0
     except Exception as e:
         logger.error(f"Synchronization failed: {e}")
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Tests for sync_readmes.py
+
+Each test builds a small source repository and config in a temporary directory and syncs it
+with ReadmeSynchronizer. Run with `python -m pytest scripts/tests`.
+"""
+
+import json
+import sys
+from pathlib import Path
+from typing import Dict, Optional
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import image_optimizer  # noqa: E402
+from sync_readmes import ReadmeSynchronizer, _log_buffer  # noqa: E402
+
+REPO = 'i4h-workflows'
+SOURCE = f'{REPO}/workflows/demo/README.md'
+TARGET = 'docs/workflows/demo.md'
+
+
+def make_tree(root: Path, readme: str, assets: Optional[Dict] = None) -> Path:
+    """Write a source repository with one README and a config syncing it, returning the config path"""
+    source = root / SOURCE
+    source.parent.mkdir(parents=True)
+    source.write_text(readme, encoding='utf-8')
+    (root / 'docs').mkdir()
+    
+    config = {
+        'repository_urls': {REPO: f'https://github.com/isaac-for-healthcare/{REPO}'},
+        'repositories': [{'name': REPO, 'main_readme': {'source': SOURCE, 'target': TARGET}}],
+    }
+    if assets is not None:
+        config['assets'] = assets
+    config_path = root / 'scripts' / 'readme-sync-config.yml'
+    config_path.parent.mkdir()
+    config_path.write_text(json.dumps(config), encoding='utf-8')
+    return config_path
+
+
+def test_enabling_optimization_rewrites_stored_images(tmp_path):
+    """Images stored without optimization are recompressed, with variants, once it is turned on"""
+    image_module = pytest.importorskip('PIL.Image')
+    config_path = make_tree(tmp_path, '# Demo\n\n![photo](img/photo.png)\n', assets={
+        'store': 'content-addressed',
+        'optimize': {'enabled': False, 'webp': True, 'widths': [32]},
+    })
+    photo = tmp_path / REPO / 'workflows' / 'demo' / 'img' / 'photo.png'
+    photo.parent.mkdir()
+    image_module.new('RGB', (64, 48), (20, 120, 220)).save(photo, compress_level=0)
+    
+    ReadmeSynchronizer(config_path, base_path=tmp_path).sync_all()
+    stored = list((tmp_path / 'docs' / 'assets' / 'images').glob('*.png'))
+    assert len(stored) == 1
+    assert stored[0].read_bytes() == photo.read_bytes()
+    
+    synchronizer = ReadmeSynchronizer(config_path, base_path=tmp_path)
+    assert synchronizer.enable_image_optimization()
+    synchronizer.sync_all()
+    
+    assert stored[0].stat().st_size < photo.stat().st_size
+    assert stored[0].with_suffix('.webp').exists()
+    assert stored[0].with_name(f'{stored[0].stem}-32w.png').exists()
+    assets = json.loads((stored[0].parent / '.asset-manifest.json').read_text())['assets']
+    assert assets[stored[0].name]['options'] == f'optimize-{synchronizer.image_optimizer.options_key}'
+    assert synchronizer.stats['cache_misses'] == 1
+
+
+def test_stored_image_is_rewritten_when_link_mode_changes(tmp_path):
+    """An image hardlinked into the store is copied once the config asks for copies"""
+    config_path = make_tree(tmp_path, '# Demo\n\n![photo](img/photo.png)\n', assets={
+        'store': 'content-addressed', 'link': 'hardlink',
+    })
+    photo = tmp_path / REPO / 'workflows' / 'demo' / 'img' / 'photo.png'
+    photo.parent.mkdir()
+    photo.write_bytes(b'not really a png')
+    
+    ReadmeSynchronizer(config_path, base_path=tmp_path).sync_all()
+    stored = list((tmp_path / 'docs' / 'assets' / 'images').glob('*.png'))
+    assert len(stored) == 1
+    assert stored[0].stat().st_ino == photo.stat().st_ino
+    
+    config = json.loads(config_path.read_text())
+    config['assets']['link'] = 'copy'
+    config_path.write_text(json.dumps(config), encoding='utf-8')
+    ReadmeSynchronizer(config_path, base_path=tmp_path).sync_all()
+    
+    assert stored[0].stat().st_ino != photo.stat().st_ino
+    assert stored[0].read_bytes() == photo.read_bytes()
+
+
+def test_link_definitions_are_rewritten(tmp_path):
+    """Reference-style link definitions point at synced pages, GitHub or stored images"""
+    config_path = make_tree(tmp_path, (
+        '# Demo\n\nSee the [other workflow][other], the [code][code] and ![logo][logo].\n\n'
+        '[other]: ../other/README.md#setup\n'
+        '[code]: <main.py> "Entry point"\n'
+        '[logo]: img/logo.png\n'
+        '[site]: https://example.com/\n'
+    ))
+    other = tmp_path / REPO / 'workflows' / 'other' / 'README.md'
+    other.parent.mkdir()
+    other.write_text('# Other\n', encoding='utf-8')
+    config = json.loads(config_path.read_text())
+    config['repositories'][0]['sub_readmes'] = [{'source': f'{REPO}/workflows/other/README.md',
+                                                 'target': 'docs/workflows/other.md'}]
+    config_path.write_text(json.dumps(config), encoding='utf-8')
+    logo = tmp_path / REPO / 'workflows' / 'demo' / 'img' / 'logo.png'
+    logo.parent.mkdir()
+    logo.write_bytes(b'logo')
+    
+    ReadmeSynchronizer(config_path, base_path=tmp_path).sync_all()
+    
+    page = (tmp_path / TARGET).read_text(encoding='utf-8')
+    assert '[other]: other.md#setup\n' in page
+    assert (f'[code]: <https://github.com/isaac-for-healthcare/{REPO}/blob/main/workflows/demo/main.py>'
+            ' "Entry point"\n') in page
+    assert '[logo]: ../../assets/images/logo.png\n' in page
+    assert '[site]: https://example.com/\n' in page
+    assert (tmp_path / 'docs' / 'assets' / 'images' / 'logo.png').exists()
+
+
+def test_references_in_fenced_code_blocks_are_left_alone(tmp_path):
+    """Images and links inside fenced code blocks are copied verbatim when syncing"""
+    code = (
+        '```markdown\n'
+        '![diagram](img/diagram.png)\n'
+        '[guide](../other/README.md)\n'
+        '[other]: ../other/README.md\n'
+        '~~~\n'
+        '```\n'
+    )
+    config_path = make_tree(tmp_path, f'# Demo\n\n![diagram](img/diagram.png)\n\n{code}\nAfter the block.\n')
+    diagram = tmp_path / REPO / 'workflows' / 'demo' / 'img' / 'diagram.png'
+    diagram.parent.mkdir()
+    diagram.write_bytes(b'diagram')
+    
+    ReadmeSynchronizer(config_path, base_path=tmp_path).sync_all()
+    
+    page = (tmp_path / TARGET).read_text(encoding='utf-8')
+    assert '![diagram](../../assets/images/diagram.png)\n' in page
+    assert code in page
+
+
+def test_pruning_removes_emptied_directories(tmp_path):
+    """Directories that only held pruned pages are removed, up to docs/"""
+    config_path = make_tree(tmp_path, '# Demo\n')
+    nested = {'source': SOURCE, 'target': 'docs/workflows/demo/nested/page.md'}
+    kept = {'source': SOURCE, 'target': 'docs/workflows/kept.md'}
+    config = json.loads(config_path.read_text())
+    config['repositories'][0]['sub_readmes'] = [nested, kept]
+    config_path.write_text(json.dumps(config), encoding='utf-8')
+    ReadmeSynchronizer(config_path, base_path=tmp_path).sync_all()
+    assert (tmp_path / nested['target']).exists()
+    
+    config['repositories'][0]['sub_readmes'] = [kept]
+    config_path.write_text(json.dumps(config), encoding='utf-8')
+    ReadmeSynchronizer(config_path, base_path=tmp_path).sync_all()
+    
+    assert not (tmp_path / 'docs' / 'workflows' / 'demo').exists()
+    assert (tmp_path / kept['target']).exists()
+    assert (tmp_path / TARGET).exists()
+
+
+def test_worker_log_buffer_captures_image_optimizer_warnings(caplog):
+    """Warnings the image optimizer logs on a worker are replayed with the worker's other lines"""
+    def work():
+        image_optimizer.logger.warning('optimizer warning')
+        return 'done'
+    
+    result, records = _log_buffer.capture(work)
+    
+    assert result == 'done'
+    assert [record.getMessage() for record in records] == ['optimizer warning']
+    assert 'optimizer warning' not in caplog.text